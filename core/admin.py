@@ -1,9 +1,15 @@
 from django.contrib import admin
-from .models import Position, Candidate, Title
+from .models import Election, Position, Candidate, Title
+
+@admin.register(Election)
+class ElectionAdmin(admin.ModelAdmin):
+    list_display = ('title', 'status', 'started_at', 'ended_at')
+    list_filter = ('status',)
 
 @admin.register(Position)
 class PositionAdmin(admin.ModelAdmin):
-    list_display = ('description', 'max_vote', 'priority')
+    list_display = ('description', 'election', 'max_vote', 'priority')
+    list_filter = ('election',)
     search_fields = ('description',)
     ordering = ('priority',)
 
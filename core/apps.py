@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from . import signals  # noqa: F401
+        from .metrics import count_queries
+        from .querylog import log_slow_queries
+
+        def install_query_instrumentation(sender, connection, **kwargs):
+            for wrapper in (count_queries, log_slow_queries):
+                if wrapper not in connection.execute_wrappers:
+                    connection.execute_wrappers.append(wrapper)
+        connection_created.connect(install_query_instrumentation, weak=False)
@@ -0,0 +1,69 @@
+import hashlib
+from django.core.cache import cache
+from .elections import current_election_id
+from .images import variant_urls
+from .models import Position, Candidate, Title
+from .renderers import dumps
+from .serializers import position_slug
+
+# The ballot only changes when an admin edits positions, candidates or the
+# title, so it is rendered to JSON once and cached until core.signals drops it.
+# The key names the election, so a new election is never served an old ballot.
+BALLOT_CACHE_KEY = 'ballot:v3:{election_id}'
+DEFAULT_ELECTION_TITLE = "Secure Aadhaar-Based E-Voting System"
+
+# What voters see of a candidate: no identity documents, addresses or
+# approval flags, and only approved candidates at all
+BALLOT_CANDIDATE_FIELDS = (
+    'id', 'position_id', 'firstname', 'lastname', 'manifesto', 'party_type', 'party_name',
+    'photo', 'photo_variants', 'symbol', 'symbol_variants',
+)
+
+def ballot_candidate(row):
+    return {
+        'id': row['id'],
+        'firstname': row['firstname'],
+        'lastname': row['lastname'],
+        'manifesto': row['manifesto'],
+        'party_type': row['party_type'],
+        'party_name': row['party_name'],
+        'photo_variants': variant_urls(row['photo'], row['photo_variants']),
+        'symbol_variants': variant_urls(row['symbol'], row['symbol_variants']),
+    }
+
+def ballot_positions(election_id):
+    """Positions in ballot order, each with its approved candidates, as plain dicts."""
+    # Two .values() queries rather than model instances and a Prefetch
+    # (which cannot take a .values() queryset)
+    positions = {
+        row['id']: {**row, 'slug': position_slug(row['description']), 'candidates': []}
+        for row in Position.objects.filter(election_id=election_id).order_by('priority', 'id')
+            .values('id', 'description', 'max_vote')
+    }
+    candidates = Candidate.objects.filter(election_id=election_id, is_approved=True).order_by('id').values(*BALLOT_CANDIDATE_FIELDS)
+    for row in candidates:
+        positions[row['position_id']]['candidates'].append(ballot_candidate(row))
+    return list(positions.values())
+
+def build_ballot(election_id=None):
+    title_obj = Title.objects.first()
+    payload = {
+        'positions': ballot_positions(election_id or current_election_id()),
+        'election_title': title_obj.header if title_obj else DEFAULT_ELECTION_TITLE
+    }
+    body = dumps(payload).decode('utf-8')
+    etag = hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+    return {'etag': etag, 'body': body}
+
+def get_ballot():
+    """Return the cached ``{'etag', 'body'}`` ballot, rendering it on a miss."""
+    election_id = current_election_id()
+    key = BALLOT_CACHE_KEY.format(election_id=election_id)
+    ballot = cache.get(key)
+    if ballot is None:
+        ballot = build_ballot(election_id)
+        cache.set(key, ballot, None)
+    return ballot
+
+def invalidate_ballot():
+    cache.delete(BALLOT_CACHE_KEY.format(election_id=current_election_id()))
@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.utils import timezone
+from .models import Election, Position, Candidate, Title
+
+PURGE_CHUNK_SIZE = 5000
+PURGEABLE_STATUSES = ('archived', 'purging', 'purge_failed')
+
+def current_election_id():
+    # Read from the database every time: it is one row of a table with a row
+    # per election, and a cached id would go stale in every worker process
+    # other than the one that started a new election
+    pk = Election.objects.filter(status='active').order_by('-id').values_list('id', flat=True).first()
+    if pk is None:
+        pk = Election.objects.create(title=default_title()).id
+    return pk
+
+def default_title():
+    title = Title.objects.first()
+    return title.header if title else 'Election'
+
+def election_changed():
+    from .ballot import invalidate_ballot
+    invalidate_ballot()
+
+@transaction.atomic
+def start_election(title=None, copy_ballot=True):
+    """Archive the current election and open a new one, copying its positions
+    and candidates unless ``copy_ballot`` is false. No votes are touched."""
+    previous = current_election_id()
+    Election.objects.filter(status='active').update(status='archived', ended_at=timezone.now())
+    election = Election.objects.create(title=title or default_title())
+    if copy_ballot:
+        positions = list(Position.objects.filter(election_id=previous).prefetch_related('candidates'))
+        ballots = [(position, list(position.candidates.all())) for position in positions]
+        for position in positions:
+            position.pk = None
+            position.election = election
+        # One insert per table however long the ballot is (pks come back from bulk_create)
+        Position.objects.bulk_create(positions)
+        candidates = []
+        for position, position_candidates in ballots:
+            for candidate in position_candidates:
+                candidate.pk = None
+                candidate.election = election
+                candidate.position = position
+                candidates.append(candidate)
+        Candidate.objects.bulk_create(candidates)
+    transaction.on_commit(election_changed)
+    return election
+
+def purge_election(election, chunk_size=PURGE_CHUNK_SIZE, progress=None):
+    """Delete an archived election's votes, receipts and ballot in short
+    transactions of ``chunk_size`` rows; the Election row stays as 'purged'.
+
+    On failure the election is marked 'purge_failed' with the error, and the
+    exception is re-raised; purging it again resumes where it stopped."""
+    from users.models import Vote, VoterBallotReceipt
+
+    Election.objects.filter(pk=election.pk).update(status='purging', purge_error='')
+    try:
+        for model in (Vote, VoterBallotReceipt):
+            while True:
+                with transaction.atomic():
+                    ids = list(model.objects.filter(election=election).values_list('id', flat=True)[:chunk_size])
+                    if not ids:
+                        break
+                    model.objects.filter(id__in=ids).delete()
+                if progress:
+                    progress(model, len(ids))
+        with transaction.atomic():
+            # Tallies go with their candidates/positions
+            Candidate.objects.filter(election=election).delete()
+            Position.objects.filter(election=election).delete()
+            Election.objects.filter(pk=election.pk).update(status='purged')
+    except Exception as e:
+        Election.objects.filter(pk=election.pk).update(status='purge_failed', purge_error=str(e) or type(e).__name__)
+        raise
@@ -0,0 +1,121 @@
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Uploaded photos and party symbols are kept as uploaded, but clients are sent
+# resized variants (settings.IMAGE_VARIANTS) re-encoded without metadata and
+# named after a hash of their content, so a URL never changes meaning and can
+# be cached forever. Variants are built in a small thread pool after the row
+# is committed; until they exist the original URL is served.
+#
+# A model opts in with a JSONField ``<field>_variants`` next to each image
+# field, holding {'source': <image name>, <variant>: <variant name>, ...}.
+
+VARIANTS_DIR = 'variants'
+
+_executor = None
+_lock = threading.Lock()
+
+def _pool():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # Pillow releases the GIL while decoding, resizing and encoding
+                _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_POOL_WORKERS, thread_name_prefix='images')
+    return _executor
+
+def render_variants(data):
+    """Return {variant: (bytes, extension)} for the image bytes in ``data``."""
+    fmt = settings.IMAGE_VARIANT_FORMAT
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+        if has_alpha and fmt == 'WEBP':
+            image = image.convert('RGBA')
+        elif has_alpha:
+            # JPEG has no alpha channel: flatten transparent symbols onto white
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+            image = background
+        else:
+            image = image.convert('RGB')
+        rendered = {}
+        for name, size in settings.IMAGE_VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail((size, size), Image.LANCZOS)
+            out = io.BytesIO()
+            # Only pixels are written: no EXIF (GPS, camera), ICC or XMP
+            variant.save(out, fmt, quality=settings.IMAGE_VARIANT_QUALITY, optimize=True)
+            rendered[name] = (out.getvalue(), 'webp' if fmt == 'WEBP' else 'jpg')
+    return rendered
+
+def store_variant(data, extension):
+    digest = hashlib.sha256(data).hexdigest()
+    name = f"{VARIANTS_DIR}/{digest[:2]}/{digest}.{extension}"
+    if default_storage.exists(name):
+        return name
+    return default_storage.save(name, ContentFile(data))
+
+def build_variants(model, pk, field):
+    """Render and store the variants of ``pk``'s image ``field`` and record them on the row."""
+    source = model.objects.filter(pk=pk).values_list(field, flat=True).first()
+    if not source:
+        return None
+    with default_storage.open(source, 'rb') as f:
+        data = f.read()
+    variants = {'source': source}
+    for name, (content, extension) in render_variants(data).items():
+        variants[name] = store_variant(content, extension)
+    # Only record them if the image was not replaced meanwhile; update() skips
+    # post_save, so this does not schedule another build
+    updated = model.objects.filter(pk=pk, **{field: source}).update(**{f'{field}_variants': variants})
+    return variants if updated else None
+
+def _build(model, pk, field, on_built):
+    try:
+        if build_variants(model, pk, field) and on_built:
+            on_built()
+    except Exception:
+        logger.exception("Image variants of %s %s %s not built", model.__name__, pk, field)
+    finally:
+        connection.close()
+
+def schedule_variants(instance, fields, on_built=None):
+    """Queue variant builds for the image ``fields`` of a saved ``instance`` whose
+    variants are stale; ``on_built`` is called after each one is recorded."""
+    model = type(instance)
+    for field in fields:
+        name = getattr(instance, field).name or None
+        variants = getattr(instance, f'{field}_variants') or {}
+        if variants.get('source') == name:
+            continue
+        if name is None:
+            setattr(instance, f'{field}_variants', {})
+            model.objects.filter(pk=instance.pk).update(**{f'{field}_variants': {}})
+            continue
+        transaction.on_commit(lambda field=field: _pool().submit(_build, model, instance.pk, field, on_built))
+
+def variant_urls(file, variants):
+    """{variant: url} for an image field (or its raw column value), falling back to the original until variants exist."""
+    if not file:
+        return None
+    name = getattr(file, 'name', file)
+    return {variant: variant_url(name, variants, variant) for variant in settings.IMAGE_VARIANTS}
+
+def variant_url(name, variants, variant):
+    """URL of one variant from raw column values (``.values()`` rows)."""
+    if not name:
+        return None
+    if (variants or {}).get('source') == name and variant in variants:
+        return default_storage.url(variants[variant])
+    return default_storage.url(name)
@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from core.ballot import invalidate_ballot
+from core.images import build_variants
+from core.models import Candidate
+from users.models import Voter
+import time
+
+IMAGE_FIELDS = [(Candidate, 'photo'), (Candidate, 'symbol'), (Voter, 'photo')]
+
+class Command(BaseCommand):
+    help = 'Builds missing or stale image variants (e.g. after seeding, or after changing IMAGE_VARIANTS with --rebuild)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Rebuild every variant, not only stale ones')
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_POOL_WORKERS)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        jobs = []
+        for model, field in IMAGE_FIELDS:
+            for pk, name, variants in model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).values_list('pk', field, f'{field}_variants'):
+                if options['rebuild'] or (variants or {}).get('source') != name:
+                    jobs.append((model, pk, field))
+
+        def build(job):
+            model, pk, field = job
+            try:
+                build_variants(model, pk, field)
+                return None
+            except Exception as e:
+                return f"{model.__name__} {pk} {field}: {e}"
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            errors = [error for error in executor.map(build, jobs) if error]
+        invalidate_ballot()
+
+        for error in errors:
+            self.stdout.write(self.style.WARNING(f"Skipped {error}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Built variants for {len(jobs) - len(errors)} of {len(jobs)} images in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.elections import PURGE_CHUNK_SIZE, PURGEABLE_STATUSES, current_election_id, purge_election
+from core.models import Election
+import time
+
+class Command(BaseCommand):
+    help = "Deletes an archived election's votes, receipts and ballot in small transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('election', type=int, help='Id of the archived election')
+        parser.add_argument('--chunk-size', type=int, default=PURGE_CHUNK_SIZE, help='Rows deleted per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            election = Election.objects.get(pk=options['election'])
+        except Election.DoesNotExist:
+            raise CommandError(f"Election {options['election']} not found")
+        if election.pk == current_election_id() or election.status not in PURGEABLE_STATUSES:
+            raise CommandError(f"Election {election.pk} is {election.status}; only archived elections can be purged")
+
+        started = time.monotonic()
+        deleted = {}
+
+        def progress(model, n):
+            deleted[model._meta.verbose_name_plural] = deleted.get(model._meta.verbose_name_plural, 0) + n
+
+        purge_election(election, chunk_size=options['chunk_size'], progress=progress)
+        summary = ', '.join(f"{n} {name}" for name, n in deleted.items()) or 'no votes'
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged election {election.pk} ({summary}) in {time.monotonic() - started:.1f}s"
+        ))
@@ -1,116 +1,181 @@
 from django.core.management.base import BaseCommand
-from core.models import Position, Candidate
-from users.models import Voter, Vote
-from datetime import datetime
-import re
-import csv
-import io
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from core.elections import default_title, election_changed
+from core.models import Election, Position, Candidate
+from core.sqldump import iter_insert_rows
+from users.models import Voter, Vote, VoterBallotReceipt
+from users.tally import rebuild_tallies
+import time
+
+# Legacy table -> (model, default column order, row -> model kwargs)
+TABLES = {
+    'positions': (Position, ['id', 'description', 'max_vote', 'priority'], lambda r: dict(
+        id=int(r['id']),
+        description=r['description'],
+        max_vote=int(r['max_vote']),
+        priority=int(r['priority'])
+    )),
+    'candidates': (Candidate, ['id', 'position_id', 'firstname', 'lastname', 'photo', 'platform'], lambda r: dict(
+        id=int(r['id']),
+        position_id=int(r['position_id']),
+        firstname=r['firstname'],
+        lastname=r['lastname'],
+        photo=r['photo'],
+        manifesto=r['platform']
+    )),
+    'voters': (Voter, ['id', 'voters_id', 'password', 'firstname', 'lastname', 'photo'], lambda r: dict(
+        id=int(r['id']),
+        voters_id=r['voters_id'],
+        password=r['password'],
+        firstname=r['firstname'],
+        lastname=r['lastname'],
+        photo=r['photo'],
+        # The legacy schema has no identity number; keep the unique column satisfied
+        aadhaar_hash=f"LEGACY-{r['id']}"
+    )),
+    'votes': (Vote, ['id', 'voters_id', 'candidate_id', 'position_id'], lambda r: dict(
+        id=int(r['id']),
+        voter_id=int(r['voters_id']),
+        candidate_id=int(r['candidate_id']),
+        position_id=int(r['position_id'])
+    )),
+}
+
+# Tables whose rows belong to the (single) election the dump is loaded into
+ELECTION_TABLES = {'positions', 'candidates', 'votes'}
+
+# Foreign keys checked against the ids already loaded: field -> parent table.
+# A table is only loaded once its parent tables are complete; one dumped before
+# its parents (candidates before positions in votesystem.sql) is read again in
+# another pass over the file rather than held in memory.
+PARENTS = {
+    'candidates': {'position_id': 'positions'},
+    'votes': {'voter_id': 'voters', 'candidate_id': 'candidates', 'position_id': 'positions'},
+}
 
 class Command(BaseCommand):
-    help = 'Seeds the database from votesystem.sql'
+    help = 'Seeds the database from a legacy votesystem.sql dump'
 
-    def parse_row(self, row_str):
-        reader = csv.reader(io.StringIO(row_str), quotechar="'", skipinitialspace=True)
-        try:
-            return next(reader)
-        except StopIteration:
-            return []
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default='database/votesystem.sql', help='Path to the SQL dump')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create')
+        parser.add_argument('--progress-every', type=int, default=100000, help='Report throughput every N rows')
 
     def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.progress_every = options['progress_every']
         try:
-            with open('database/votesystem.sql', 'r', encoding='utf-8') as f:
-                content = f.read()
+            dump = open(options['file'], 'r', encoding='utf-8')
         except FileNotFoundError:
-            self.stdout.write(self.style.ERROR('database/votesystem.sql not found'))
+            self.stdout.write(self.style.ERROR(f"{options['file']} not found"))
+            return
+
+        self.ids = {table: set() for table in TABLES}
+        self.pending = {table: [] for table in TABLES}
+        self.voted = set()
+        self.loaded = 0
+        self.started = time.monotonic()
+
+        with dump, transaction.atomic():
+            # Clear existing data
+            Vote.objects.all().delete()
+            VoterBallotReceipt.objects.all().delete()
+            Candidate.objects.all().delete()
+            Position.objects.all().delete()
+            Voter.objects.all().delete()
+            Election.objects.all().delete()
+            self.election = Election.objects.create(title=default_title())
+
+            self.stdout.write(f"Streaming {options['file']}...")
+            tables = self.load_pass(dump, set(TABLES))
+            while tables:
+                self.stdout.write(f"Re-reading {options['file']} for {', '.join(sorted(tables))} (dumped before their parent tables)...")
+                dump.seek(0)
+                tables = self.load_pass(dump, tables)
+
+            VoterBallotReceipt.objects.bulk_create(
+                [VoterBallotReceipt(voter_id=pk, election=self.election) for pk in self.voted], batch_size=self.batch_size
+            )
+            self.reset_sequences()
+            rebuild_tallies()
+            # bulk_create sends no signals, so drop the cached election and ballot explicitly
+            transaction.on_commit(election_changed)
+
+        elapsed = time.monotonic() - self.started
+        summary = ', '.join(f"{len(ids)} {table}" for table, ids in self.ids.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully seeded database: {summary} in {elapsed:.1f}s ({self.loaded / max(elapsed, 1e-9):.0f} rows/s)'
+        ))
+
+    def load_pass(self, dump, tables):
+        """Load ``tables`` in one read of the dump; return the ones left for another pass.
+
+        Tables are taken to be dumped one after another, so a table is complete
+        once the next one starts. A table whose parents are not all complete
+        when its first row is read is skipped whole in this pass.
+        """
+        complete = set(TABLES) - tables
+        later = set()
+        current = None
+        for table, columns, values in iter_insert_rows(dump):
+            if table not in TABLES:
+                continue
+            if table != current:
+                if current in tables and current not in later:
+                    complete.add(current)
+                    self.flush(current)
+                current = table
+                if table in tables and table not in complete and any(
+                    parent not in complete for parent in PARENTS.get(table, {}).values()
+                ):
+                    later.add(table)
+            if table in tables and table not in later:
+                self.add_row(table, columns, values)
+        for table in TABLES:
+            self.flush(table)
+        return later
+
+    def add_row(self, table, columns, values):
+        model, default_columns, convert = TABLES[table]
+        row = dict(zip(columns or default_columns, values))
+        try:
+            fields = convert(row)
+        except (KeyError, TypeError, ValueError) as e:
+            self.stdout.write(self.style.WARNING(f"Skipping {table} row {values[:1]}: {e!r}"))
+            return
+        self.add_fields(table, fields)
+
+    def add_fields(self, table, fields):
+        for field, parent in PARENTS.get(table, {}).items():
+            if fields[field] not in self.ids[parent]:
+                self.stdout.write(self.style.WARNING(f"Skipping {table} {fields['id']}: {parent} {fields[field]} not found"))
+                return
+        self.ids[table].add(fields['id'])
+        if table in ELECTION_TABLES:
+            fields['election_id'] = self.election.id
+        if table == 'votes':
+            self.voted.add(fields['voter_id'])
+        self.pending[table].append(TABLES[table][0](**fields))
+        if len(self.pending[table]) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table):
+        rows = self.pending[table]
+        if not rows:
             return
+        # Legacy dumps may repeat a (voter, position, candidate) vote
+        TABLES[table][0].objects.bulk_create(rows, ignore_conflicts=(table == 'votes'))
+        before = self.loaded
+        self.loaded += len(rows)
+        self.pending[table] = []
+        if self.loaded // self.progress_every > before // self.progress_every:
+            elapsed = time.monotonic() - self.started
+            self.stdout.write(f"  {self.loaded} rows loaded ({self.loaded / max(elapsed, 1e-9):.0f} rows/s)")
 
-        # Clear existing data
-        Vote.objects.all().delete()
-        Candidate.objects.all().delete()
-        Position.objects.all().delete()
-        Voter.objects.all().delete()
-
-        # Positions
-        self.stdout.write("Seeding Positions...")
-        pos_pattern = r"INSERT INTO `positions` .*? VALUES\s*(.*?);"
-        pos_matches = re.search(pos_pattern, content, re.DOTALL)
-        if pos_matches:
-            rows = re.findall(r"\((.*?)\)(?:,|$)", pos_matches.group(1))
-            for row_str in rows:
-                cols = self.parse_row(row_str)
-                if not cols or len(cols) < 4: continue
-                # id, description, max_vote, priority
-                Position.objects.create(
-                    id=int(cols[0]),
-                    description=cols[1],
-                    max_vote=int(cols[2]),
-                    priority=int(cols[3])
-                )
-
-        # Candidates
-        self.stdout.write("Seeding Candidates...")
-        cand_pattern = r"INSERT INTO `candidates` .*? VALUES\s*(.*?);"
-        cand_matches = re.search(cand_pattern, content, re.DOTALL)
-        if cand_matches:
-            rows = re.findall(r"\((.*?)\)(?:,|$)", cand_matches.group(1))
-            for row_str in rows:
-                cols = self.parse_row(row_str)
-                if not cols or len(cols) < 6: continue
-                # id, position_id, firstname, lastname, photo, platform
-                try:
-                    pos = Position.objects.get(id=int(cols[1]))
-                    Candidate.objects.create(
-                        id=int(cols[0]),
-                        position=pos,
-                        firstname=cols[2],
-                        lastname=cols[3],
-                        photo=cols[4],
-                        platform=cols[5]
-                    )
-                except Position.DoesNotExist:
-                    self.stdout.write(self.style.WARNING(f"Position {cols[1]} not found for candidate {cols[2]}"))
-
-
-        # Voters
-        self.stdout.write("Seeding Voters...")
-        voter_pattern = r"INSERT INTO `voters` .*? VALUES\s*(.*?);"
-        voter_matches = re.search(voter_pattern, content, re.DOTALL)
-        if voter_matches:
-            rows = re.findall(r"\((.*?)\)(?:,|$)", voter_matches.group(1))
-            for row_str in rows:
-                cols = self.parse_row(row_str)
-                if not cols or len(cols) < 6: continue
-                # id, voters_id, password, firstname, lastname, photo
-                Voter.objects.create(
-                    id=int(cols[0]),
-                    voters_id=cols[1],
-                    password=cols[2],
-                    firstname=cols[3],
-                    lastname=cols[4],
-                    photo=cols[5]
-                )
-
-        # Votes
-        self.stdout.write("Seeding Votes...")
-        vote_pattern = r"INSERT INTO `votes` .*? VALUES\s*(.*?);"
-        vote_matches = re.search(vote_pattern, content, re.DOTALL)
-        if vote_matches:
-            rows = re.findall(r"\((.*?)\)(?:,|$)", vote_matches.group(1))
-            for row_str in rows:
-                cols = self.parse_row(row_str)
-                if not cols or len(cols) < 4: continue
-                # id, voters_id, candidate_id, position_id
-                try:
-                    voter = Voter.objects.get(id=int(cols[1]))
-                    candidate = Candidate.objects.get(id=int(cols[2]))
-                    pos = Position.objects.get(id=int(cols[3]))
-                    Vote.objects.create(
-                        id=int(cols[0]),
-                        voter=voter,
-                        candidate=candidate,
-                        position=pos
-                    )
-                except Exception as e:
-                    self.stdout.write(self.style.WARNING(f"Skipping vote {cols[0]}: {e}"))
-
-        self.stdout.write(self.style.SUCCESS('Successfully seeded database'))
+    def reset_sequences(self):
+        # Rows were inserted with explicit ids; move auto-increment past them
+        statements = connection.ops.sequence_reset_sql(no_style(), [Position, Candidate, Voter, Vote])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,136 @@
+from collections import Counter
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from core.elections import default_title, election_changed
+from core.models import Election, Position, Candidate
+from users.models import Voter, Vote, VoterBallotReceipt, CandidateTally, PositionTally
+import bcrypt
+import random
+import string
+import time
+
+# voters_id keeps the "3 letters + 6 digits" shape of generate_voter_id. Voter
+# number i is spread over the 26^3 * 10^6 id space with a multiplier coprime
+# to it, which gives unique, non-sequential ids without any lookups.
+VOTER_ID_SPACE = 26 ** 3 * 10 ** 6
+VOTER_ID_STRIDE = 7919
+
+def synthetic_voter_id(i):
+    n = (i * VOTER_ID_STRIDE + 104729) % VOTER_ID_SPACE
+    letters, digits = divmod(n, 10 ** 6)
+    return ''.join(string.ascii_uppercase[letters // 26 ** k % 26] for k in (2, 1, 0)) + f"{digits:06d}"
+
+def insert_rows(cursor, model, fields, rows):
+    # executemany straight into the table: at millions of rows the per-object
+    # pre_save/prep work inside bulk_create costs more than the inserts
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(name).column) for name in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    cursor.executemany(f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})", rows)
+
+VOTER_FIELDS = ['id', 'voters_id', 'password', 'firstname', 'lastname', 'gender', 'identity_type', 'aadhaar_hash', 'age', 'address', 'photo_variants']
+VOTE_FIELDS = ['id', 'voter', 'election', 'candidate', 'position', 'timestamp']
+LASTNAMES = ['Sharma', 'Patel', 'Singh', 'Kumar', 'Das', 'Rao', 'Iyer', 'Khan']
+GENDERS = ['Male', 'Female', 'Other']
+POLLING_HOURS = 10
+
+class Command(BaseCommand):
+    help = 'Replaces the election data with a deterministic synthetic election for scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--voters', type=int, default=10000)
+        parser.add_argument('--positions', type=int, default=4)
+        parser.add_argument('--candidates-per-position', type=int, default=5)
+        parser.add_argument('--turnout', type=float, default=0.6, help='Fraction of voters who cast a ballot (0-1)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed; same seed, same election')
+        parser.add_argument('--password', default='password', help='Password shared by every synthetic voter')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Voters per insert batch')
+
+    def handle(self, *args, **options):
+        if options['voters'] > VOTER_ID_SPACE:
+            raise CommandError(f"At most {VOTER_ID_SPACE} voters are supported")
+        if not 0 <= options['turnout'] <= 1:
+            raise CommandError('--turnout must be between 0 and 1')
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        started = time.monotonic()
+
+        # Hashed once: bcrypt per voter would dominate the run
+        password = bcrypt.hashpw(options['password'].encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+        # Votes are spread evenly over a polling day that ended now
+        polls_open = timezone.now() - timedelta(hours=POLLING_HOURS)
+        step = timedelta(hours=POLLING_HOURS) / max(options['voters'], 1)
+        adapt = connection.ops.adapt_datetimefield_value
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Clear existing data (plain DELETEs: the ORM collector would load every row)
+            for model in (Vote, VoterBallotReceipt, CandidateTally, PositionTally, Candidate, Position, Voter, Election):
+                cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
+            election = Election.objects.create(title=default_title())
+
+            self.stdout.write("Creating Positions and Candidates...")
+            ballot = []
+            candidate_id = 0
+            for p in range(1, options['positions'] + 1):
+                max_vote = 1 if p % 3 else 2
+                Position.objects.create(id=p, election=election, description=f"Position {p}", max_vote=max_vote, priority=p)
+                candidates = []
+                for c in range(options['candidates_per_position']):
+                    candidate_id += 1
+                    candidates.append(Candidate(
+                        id=candidate_id, election=election, position_id=p, candidate_id=f"CSYN{candidate_id:06d}",
+                        firstname=f"Candidate{candidate_id}", lastname=f"P{p}",
+                        gender=rng.choice(['Male', 'Female', 'Other']),
+                        party_type=rng.choice(['party', 'independent']),
+                    ))
+                Candidate.objects.bulk_create(candidates)
+                # Uneven popularity so tallies are not flat
+                weights = [rng.paretovariate(1.5) for _ in candidates]
+                ballot.append((p, min(max_vote, len(candidates)), [c.id for c in candidates], weights))
+
+            self.stdout.write(f"Creating {options['voters']} Voters and their votes...")
+            by_candidate = Counter()
+            by_position = Counter()
+            voters, votes, receipts = [], [], []
+            vote_id = 0
+            for i in range(1, options['voters'] + 1):
+                voters.append((
+                    i, synthetic_voter_id(i), password, f"Voter{i}", rng.choice(LASTNAMES),
+                    rng.choice(GENDERS), 'aadhaar', f"SYN{i:012d}", rng.randint(18, 90), f"{i} Synthetic Street", '{}',
+                ))
+                if rng.random() < options['turnout']:
+                    cast_at = adapt(polls_open + step * i)
+                    receipts.append((i, election.id, cast_at))
+                    for pos_id, picks, candidate_ids, weights in ballot:
+                        chosen = set()
+                        while len(chosen) < picks:
+                            chosen.add(rng.choices(candidate_ids, weights)[0])
+                        for cand_id in sorted(chosen):
+                            vote_id += 1
+                            votes.append((vote_id, i, election.id, cand_id, pos_id, cast_at))
+                            by_candidate[cand_id] += 1
+                            by_position[pos_id] += 1
+                if len(voters) >= batch_size or i == options['voters']:
+                    insert_rows(cursor, Voter, VOTER_FIELDS, voters)
+                    insert_rows(cursor, VoterBallotReceipt, ['voter', 'election', 'timestamp'], receipts)
+                    insert_rows(cursor, Vote, VOTE_FIELDS, votes)
+                    voters, votes, receipts = [], [], []
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(f"  {i} voters, {vote_id} votes ({i / max(elapsed, 1e-9):.0f} voters/s)")
+
+            CandidateTally.objects.bulk_create([CandidateTally(candidate_id=pk, votes=n) for pk, n in by_candidate.items()])
+            PositionTally.objects.bulk_create([PositionTally(position_id=pk, votes=n) for pk, n in by_position.items()])
+
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Position, Candidate, Voter, Vote]):
+                cursor.execute(sql)
+            # Raw inserts send no signals, so drop the cached election and ballot explicitly
+            transaction.on_commit(election_changed)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully generated {options['voters']} voters, {vote_id} votes in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,123 @@
+import bisect
+import contextvars
+import threading
+import time
+from collections import defaultdict
+
+# In-process metrics in the Prometheus text format, served at /metrics
+# (core.views.metrics). Recording is a lock and a couple of additions, cheap
+# enough for every request. Each worker process keeps its own numbers, so
+# scrape every worker (or run one) rather than a load balancer in front of them.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help, labels):
+        self.name, self.help, self.labels = name, help, labels
+        self.values = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self.lock:
+            self.values[labels] += amount
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+        for labels, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labels, labels)), value
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        # labels -> [count per bucket..., +Inf count, sum]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.values.get(labels)
+            if counts is None:
+                counts = self.values[labels] = [0] * (len(self.buckets) + 2)
+            counts[i] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self.lock:
+            values = {labels: list(counts) for labels, counts in self.values.items()}
+        for labels, counts in sorted(values.items()):
+            base = dict(zip(self.labels, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', {**base, 'le': '+Inf' if bound == float('inf') else repr(bound)}, cumulative
+            yield f'{self.name}_count', base, cumulative
+            yield f'{self.name}_sum', base, counts[-1]
+
+REGISTRY = []
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+http_requests = register(Counter(
+    'evoting_http_requests_total', 'Requests handled, by URL name, method and status code.', ('view', 'method', 'status'),
+))
+http_latency = register(Histogram(
+    'evoting_http_request_duration_seconds', 'Time until the response (or its first chunk) was ready, by URL name.', ('view', 'method'),
+))
+db_queries = register(Counter(
+    'evoting_db_queries_total', 'SQL queries run while handling requests, by URL name.', ('view',),
+))
+db_time = register(Counter(
+    'evoting_db_query_seconds_total', 'Time spent in SQL queries while handling requests, by URL name.', ('view',),
+))
+bcrypt_latency = register(Histogram(
+    'evoting_bcrypt_duration_seconds', 'Password hashing/checking time in the bcrypt pool, queueing included.', ('op',),
+))
+login_failures = register(Counter(
+    'evoting_login_failures_total', 'Voter logins refused or failed, by reason (unknown_voter, no_password, wrong_password, busy, error).', ('reason',),
+))
+
+# Query stats of the request being handled; sync_to_async copies the context,
+# so queries an async view runs in a thread are counted too
+current_request = contextvars.ContextVar('metrics_request', default=None)
+
+class RequestStats:
+    __slots__ = ('queries', 'query_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+
+def count_queries(execute, sql, params, many, context):
+    """Connection execute_wrapper (installed on every connection by core.apps)."""
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_time += time.perf_counter() - started
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for value in labels.values())
+    return '{' + ','.join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + '}'
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for name, labels, value in metric.samples():
+            lines.append(f'{name}{format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,117 @@
+import asyncio
+import re
+import time
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from . import metrics
+from .profiling import RequestProfile, current_task, profile_requested, profile_token
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compresses responses of at least COMPRESSION_MIN_SIZE bytes (and streamed
+    exports), with Brotli when it is installed and the client accepts it, else gzip."""
+
+    def process_response(self, request, response):
+        if response.get('Content-Type', '').startswith(('text/event-stream', 'image/')):
+            # Live tally events must go out as soon as they are written; images are compressed already
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        accepts_brotli = re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if response.streaming or brotli is None or not accepts_brotli or response.has_header('Content-Encoding'):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=settings.BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        if response.has_header('ETag'):
+            response.headers['ETag'] = re.sub(r'^"', 'W/"', response.headers['ETag'])
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+class MetricsMiddleware:
+    """Records latency, status and SQL queries/time per URL name (core.metrics)."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = metrics.RequestStats()
+        token = metrics.current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = metrics.RequestStats()
+        token = metrics.current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, stats, elapsed):
+        match = request.resolver_match
+        # Label by URL name, never by path, so ids in URLs cannot blow up the series count
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        metrics.http_requests.inc((view, request.method, str(response.status_code)))
+        metrics.http_latency.observe((view, request.method), elapsed)
+        if stats.queries:
+            metrics.db_queries.inc((view,), stats.queries)
+            metrics.db_time.inc((view,), stats.query_time)
+
+class ProfilingMiddleware:
+    """Profiles requests that ask for it with an admin token (core.profiling)."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not profile_requested(request):
+            return self.get_response(request)
+        return RequestProfile().run(self.get_response, request)
+
+    async def __acall__(self, request):
+        # Lets app_frame() attribute the queries of async views (profiles, core.querylog)
+        current_task.set(asyncio.current_task())
+        if profile_token(request) is None or not await sync_to_async(profile_requested)(request):
+            return await self.get_response(request)
+        # The profiler follows one thread: hand the request to a fresh one, in
+        # which sync views and the sync_to_async calls of async views then run
+        return await sync_to_async(RequestProfile().run, thread_sensitive=False)(async_to_sync(self.traced_response), request)
+
+    async def traced_response(self, request):
+        # async_to_sync runs this in a new task on the event loop
+        current_task.set(asyncio.current_task())
+        return await self.get_response(request)
@@ -0,0 +1,65 @@
+# Generated by Django 5.0 on 2026-10-18 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_first_election(apps, schema_editor):
+    # Everything recorded so far becomes the first election; a fresh database
+    # gets an empty one so there is always a current election
+    Election = apps.get_model('core', 'Election')
+    Title = apps.get_model('core', 'Title')
+    title = Title.objects.first()
+    election = Election.objects.create(title=title.header if title else 'Election')
+    apps.get_model('core', 'Position').objects.update(election=election)
+    apps.get_model('core', 'Candidate').objects.update(election=election)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_rename_platform_candidate_manifesto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Election',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('archived', 'Archived'), ('purging', 'Purging'), ('purged', 'Purged')], default='active', max_length=10)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='election',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='positions', to='core.election'),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='election',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='candidates', to='core.election'),
+        ),
+        migrations.RunPython(create_first_election, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='position',
+            name='election',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='positions', to='core.election'),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='election',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidates', to='core.election'),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='candidate_id',
+            field=models.CharField(blank=True, max_length=15, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='candidate',
+            constraint=models.UniqueConstraint(fields=('election', 'candidate_id'), name='unique_candidate_id_per_election'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_elections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='symbol_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
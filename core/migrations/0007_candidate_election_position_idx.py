@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['election', 'position'], name='candidate_election_pos_idx'),
+        ),
+    ]
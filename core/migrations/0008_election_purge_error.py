@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_candidate_election_position_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='purge_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='election',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('archived', 'Archived'), ('purging', 'Purging'), ('purge_failed', 'Purge failed'), ('purged', 'Purged')], default='active', max_length=12),
+        ),
+    ]
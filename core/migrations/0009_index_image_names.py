@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_election_purge_error'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidate',
+            name='photo',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='candidates/photos/'),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='symbol',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='candidates/symbols/'),
+        ),
+    ]
@@ -1,6 +1,27 @@
 from django.db import models
 
+class Election(models.Model):
+    # Positions, candidates and votes belong to one election. Resetting the
+    # votes starts a new election (core.elections.start_election); the old one
+    # is archived as it was and can be purged later.
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('archived', 'Archived'),
+        ('purging', 'Purging'),
+        ('purge_failed', 'Purge failed'),
+        ('purged', 'Purged'),
+    ]
+    title = models.CharField(max_length=100)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='active')
+    started_at = models.DateTimeField(auto_now_add=True)
+    ended_at = models.DateTimeField(null=True, blank=True)
+    purge_error = models.TextField(blank=True)  # why the last purge stopped; cleared on retry
+
+    def __str__(self):
+        return f"{self.title} ({self.started_at:%Y-%m-%d})"
+
 class Position(models.Model):
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='positions')
     description = models.CharField(max_length=50)
     max_vote = models.IntegerField()
     priority = models.IntegerField()
@@ -9,11 +30,13 @@ class Position(models.Model):
         return self.description
 
 class Candidate(models.Model):
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='candidates')
     position = models.ForeignKey(Position, on_delete=models.CASCADE, related_name='candidates')
-    candidate_id = models.CharField(max_length=15, unique=True, null=True, blank=True) # Automated ID
+    candidate_id = models.CharField(max_length=15, null=True, blank=True) # Automated ID, unique per election
     firstname = models.CharField(max_length=30)
     lastname = models.CharField(max_length=30)
-    photo = models.ImageField(upload_to='candidates/photos/', blank=True, null=True)
+    photo = models.ImageField(upload_to='candidates/photos/', blank=True, null=True, db_index=True)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)  # core.images
     manifesto = models.TextField(blank=True, null=True) # Renamed from platform
     
     # Identity
@@ -41,13 +64,24 @@ class Candidate(models.Model):
     ]
     party_type = models.CharField(max_length=20, choices=PARTY_TYPE_CHOICES, default='independent')
     party_name = models.CharField(max_length=100, blank=True, null=True)
-    symbol = models.ImageField(upload_to='candidates/symbols/', blank=True, null=True)
+    symbol = models.ImageField(upload_to='candidates/symbols/', blank=True, null=True, db_index=True)
+    symbol_variants = models.JSONField(default=dict, blank=True, editable=False)  # core.images
     
     # Legacy/Meta
     aadhaar_hash = models.CharField(max_length=255, blank=True, null=True) # Keeping for safety during migration, verify if needed
     party_symbol = models.CharField(max_length=150, blank=True, null=True) # Legacy
     is_approved = models.BooleanField(default=True)
 
+    class Meta:
+        constraints = [
+            # Candidates carry their ID over when the ballot is copied into a new election
+            models.UniqueConstraint(fields=['election', 'candidate_id'], name='unique_candidate_id_per_election'),
+        ]
+        indexes = [
+            # Admin candidate listing filtered by position, newest first (the rowid ends the index)
+            models.Index(fields=['election', 'position'], name='candidate_election_pos_idx'),
+        ]
+
     def __str__(self):
         return f"{self.firstname} {self.lastname}"
 
@@ -0,0 +1,171 @@
+import cProfile
+import contextvars
+import json
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+# On-demand profiling (core.middleware.ProfilingMiddleware). A request that
+# carries an admin token in the X-Profile-Token header (or the _profile query
+# parameter) runs under cProfile with every SQL statement recorded, and the
+# result is written to PROFILE_DIR:
+#   <id>.prof  pstats data (snakeviz, flameprof, gprof2dot...)
+#   <id>.json  request, timings and the SQL statements with the line that issued them
+# Requests without the flag only pay for a dict lookup.
+
+PROFILE_HEADER = 'HTTP_X_PROFILE_TOKEN'
+PROFILE_PARAM = '_profile'
+PROFILE_ID = re.compile(r'[0-9]{8}T[0-9]{6}-[0-9a-f]{8}')
+
+# One profile at a time: the profiler hooks are process-wide on newer Pythons
+_running = threading.Lock()
+
+_project_dir = str(settings.BASE_DIR) + os.sep
+# Instrumentation frames, never the origin of a query
+_skip_files = tuple(os.path.join('core', name) for name in ('profiling.py', 'metrics.py', 'middleware.py', 'querylog.py'))
+
+# Task running the current async request. An async view's queries run in a
+# sync_to_async thread whose stack ends in asgiref, so their origin is found
+# by following what the (suspended) request coroutine is awaiting instead
+current_task = contextvars.ContextVar('profiling_task', default=None)
+
+def _is_app_frame(frame):
+    filename = frame.f_code.co_filename
+    return filename.startswith(_project_dir) and 'site-packages' not in filename and not filename.endswith(_skip_files)
+
+def _describe(frame):
+    return f"{frame.f_code.co_filename[len(_project_dir):]}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+def _awaited_frames(task):
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'gi_frame', None)
+        if frame is not None:
+            yield frame
+        awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'gi_yieldfrom', None)
+
+def app_frame():
+    """'path:line in function' of the innermost project frame (outside Django/site-packages) that issued the current call."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if _is_app_frame(frame):
+            return _describe(frame)
+        frame = frame.f_back
+    task = current_task.get()
+    if task is not None:
+        for frame in reversed(list(_awaited_frames(task))):
+            if _is_app_frame(frame):
+                return _describe(frame)
+    return None
+
+def profile_token(request):
+    token = request.META.get(PROFILE_HEADER)
+    if token is None and f'{PROFILE_PARAM}=' in request.META.get('QUERY_STRING', ''):
+        token = request.GET.get(PROFILE_PARAM)
+    return token
+
+def profile_requested(request):
+    token = profile_token(request)
+    if token is None:
+        return False
+    from users import tokens
+    return tokens.verify(token, tokens.ADMIN) is not None
+
+class RequestProfile:
+    """Profiles the code run in the current thread, and the queries it makes on the default database."""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.statements = []
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.statements.append({
+                'sql': sql,
+                'many': many,
+                'ms': round((time.perf_counter() - started) * 1000, 3),
+                'origin': app_frame(),
+            })
+
+    def run(self, get_response, request):
+        if not _running.acquire(blocking=False):
+            return get_response(request)
+        try:
+            started = time.perf_counter()
+            with connection.execute_wrapper(self.record_query):
+                self.profiler.enable()
+                try:
+                    response = get_response(request)
+                finally:
+                    self.profiler.disable()
+        finally:
+            _running.release()
+        response['X-Profile-Id'] = self.save(request, response, time.perf_counter() - started)
+        return response
+
+    def save(self, request, response, elapsed):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        profile_id = f"{timezone.now():%Y%m%dT%H%M%S}-{secrets.token_hex(4)}"
+        path = os.path.join(settings.PROFILE_DIR, profile_id)
+        self.profiler.dump_stats(path + '.prof')
+        match = request.resolver_match
+        summary = {
+            'id': profile_id,
+            'created': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'view': (match.url_name or match.view_name) if match else None,
+            'status': response.status_code,
+            'ms': round(elapsed * 1000, 3),
+            'queries': len(self.statements),
+            'query_ms': round(sum(s['ms'] for s in self.statements), 3),
+        }
+        with open(path + '.json', 'w') as f:
+            json.dump({**summary, 'statements': self.statements}, f, indent=1)
+        prune_profiles()
+        return profile_id
+
+def prune_profiles():
+    ids = sorted(list_profile_ids())
+    for profile_id in ids[:max(len(ids) - settings.PROFILE_MAX_KEPT, 0)]:
+        for extension in ('.prof', '.json'):
+            try:
+                os.remove(os.path.join(settings.PROFILE_DIR, profile_id + extension))
+            except FileNotFoundError:
+                pass
+
+def list_profile_ids():
+    try:
+        names = os.listdir(settings.PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    return [name[:-5] for name in names if name.endswith('.json') and PROFILE_ID.fullmatch(name[:-5])]
+
+def list_profiles():
+    """Summaries of the stored profiles, newest first."""
+    profiles = []
+    for profile_id in sorted(list_profile_ids(), reverse=True):
+        try:
+            with open(os.path.join(settings.PROFILE_DIR, profile_id + '.json')) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            continue
+        data.pop('statements', None)
+        profiles.append(data)
+    return profiles
+
+def profile_path(profile_id, extension):
+    """Path of a stored profile file, or None if ``profile_id`` is not one."""
+    if not PROFILE_ID.fullmatch(profile_id):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, profile_id + extension)
+    return path if os.path.exists(path) else None
@@ -0,0 +1,77 @@
+import re
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from django.utils import timezone
+from .profiling import app_frame
+
+# Slow-query log. Every connection runs its statements through
+# log_slow_queries (installed by core.apps); those taking SLOW_QUERY_MS or
+# longer are kept, newest last, in a ring buffer of SLOW_QUERY_LOG_SIZE
+# entries with the project line that issued them. Parameter values are not
+# kept (they include voter ids and password hashes), only their types.
+
+_entries = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+_lock = threading.Lock()
+
+_placeholder_list = re.compile(r'\(\s*%s(?:\s*,\s*%s)+\s*\)')
+_string_literal = re.compile(r"'(?:[^']|'')*'")
+_number_literal = re.compile(r'\b\d+(?:\.\d+)?\b')
+_whitespace = re.compile(r'\s+')
+
+def normalize_sql(sql):
+    """The statement with literals replaced and IN lists collapsed, so repeats of one ORM call look alike."""
+    sql = _placeholder_list.sub('(%s, ...)', sql)
+    sql = _string_literal.sub('?', sql)
+    sql = _number_literal.sub('?', sql)
+    return _whitespace.sub(' ', sql).strip()
+
+def _types(values):
+    # Run-length encoded type names: (int, int, int, str) -> ['int×3', 'str']
+    shape = []
+    for value in values:
+        name = type(value).__name__
+        if shape and shape[-1][0] == name:
+            shape[-1][1] += 1
+        else:
+            shape.append([name, 1])
+    return [name if count == 1 else f'{name}×{count}' for name, count in shape]
+
+def params_shape(params, many):
+    if params is None:
+        return None
+    if many:
+        params = list(params)
+        return {'rows': len(params), 'row': params_shape(params[0], False) if params else None}
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return _types(params)
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Connection execute_wrapper keeping statements over SLOW_QUERY_MS."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        if settings.SLOW_QUERY_MS is not None and elapsed >= settings.SLOW_QUERY_MS:
+            entry = {
+                'at': timezone.now(),
+                'ms': round(elapsed, 3),
+                'sql': normalize_sql(sql),
+                'params': params_shape(params, many),
+                'origin': app_frame(),
+                'database': context['connection'].alias,
+            }
+            with _lock:
+                _entries.append(entry)
+
+def slow_queries():
+    """The logged statements, newest first."""
+    with _lock:
+        return list(reversed(_entries))
+
+def clear():
+    with _lock:
+        _entries.clear()
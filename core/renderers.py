@@ -0,0 +1,36 @@
+import json
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: without it everything goes through the json module as before
+    orjson = None
+
+# orjson encodes what serializers produce (dicts, lists, str, numbers,
+# datetimes, UUIDs) natively in C; anything else (Decimal, lazy translation
+# strings, querysets...) is handed to DRF's JSONEncoder.default, so the output
+# matches JSONRenderer's apart from whitespace.
+
+_default = JSONEncoder().default
+
+def dumps(data, indent=False):
+    """JSON bytes for ``data``, encoded the way DRF's JSONRenderer does it."""
+    if orjson is None:
+        return json.dumps(
+            data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False,
+            indent=2 if indent else None, separators=None if indent else (',', ':'),
+        ).encode('utf-8')
+    option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=_default, option=option)
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        ret = dumps(data, indent=bool(indent))
+        # As JSONRenderer does, keep the output safe to embed in <script>
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -1,33 +1,62 @@
+import re
 from rest_framework import serializers
-from .models import Position, Candidate, Title
+from .elections import current_election_id
+from .images import variant_urls
+from .models import Election, Position, Candidate, Title
 
 class CandidateSerializer(serializers.ModelSerializer):
     position_name = serializers.CharField(source='position.description', read_only=True)
+    photo_variants = serializers.SerializerMethodField()
+    symbol_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = Candidate
         fields = [
             'id', 'position', 'position_name', 'candidate_id', 
-            'firstname', 'lastname', 'photo', 'manifesto', 
+            'firstname', 'lastname', 'photo', 'photo_variants', 'manifesto', 
             'identity_type', 'identity_number', 'gender', 'address',
-            'party_type', 'party_name', 'symbol', 
+            'party_type', 'party_name', 'symbol', 'symbol_variants',
             'is_approved'
         ]
 
-class PositionSerializer(serializers.ModelSerializer):
-    candidates = CandidateSerializer(many=True, read_only=True)
+    def get_photo_variants(self, obj):
+        return variant_urls(obj.photo, obj.photo_variants)
+
+    def get_symbol_variants(self, obj):
+        return variant_urls(obj.symbol, obj.symbol_variants)
+
+    def validate_position(self, position):
+        if position.election_id != current_election_id():
+            raise serializers.ValidationError('This position belongs to another election.')
+        return position
+
+def position_slug(description):
+    return re.sub(r'[^a-z0-9]+', '_', description.lower()).strip('_')
+
+class PositionSummarySerializer(serializers.ModelSerializer):
+    # Only present when the queryset is annotated with it
+    candidate_count = serializers.IntegerField(read_only=True)
     slug = serializers.SerializerMethodField()
 
     class Meta:
         model = Position
-        fields = ['id', 'description', 'max_vote', 'priority', 'candidates', 'slug']
-        
+        fields = ['id', 'description', 'max_vote', 'priority', 'candidate_count', 'slug']
+
     def get_slug(self, obj):
-        import re
-        text = obj.description.lower()
-        return re.sub(r'[^a-z0-9]+', '_', text).strip('_')
+        return position_slug(obj.description)
+
+class PositionSerializer(PositionSummarySerializer):
+    candidates = CandidateSerializer(many=True, read_only=True)
+
+    class Meta(PositionSummarySerializer.Meta):
+        fields = ['id', 'description', 'max_vote', 'priority', 'candidates', 'candidate_count', 'slug']
 
 class TitleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Title
         fields = ['id', 'header']
+
+class ElectionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Election
+        fields = ['id', 'title', 'status', 'started_at', 'ended_at', 'purge_error']
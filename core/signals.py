@@ -0,0 +1,31 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Position, Candidate, Title
+from .ballot import invalidate_ballot
+from .images import schedule_variants
+from .storage import release_files, replaced_files
+
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=Candidate)
+@receiver([post_save, post_delete], sender=Title)
+def ballot_changed(sender, **kwargs):
+    invalidate_ballot()
+
+@receiver(post_save, sender=Candidate)
+def candidate_images_changed(sender, instance, **kwargs):
+    # The cached ballot carries variant URLs, so drop it once they are built
+    schedule_variants(instance, ['photo', 'symbol'], on_built=invalidate_ballot)
+
+# Stored files are shared between rows (core.storage); drop the ones a candidate no longer uses
+
+@receiver(pre_save, sender=Candidate)
+def candidate_files_replaced(sender, instance, **kwargs):
+    instance._replaced_files = replaced_files(instance, ['photo', 'symbol'])
+
+@receiver(post_save, sender=Candidate)
+def release_replaced_candidate_files(sender, instance, **kwargs):
+    release_files(instance.photo.storage, getattr(instance, '_replaced_files', []))
+
+@receiver(post_delete, sender=Candidate)
+def release_candidate_files(sender, instance, **kwargs):
+    release_files(instance.photo.storage, [instance.photo.name, instance.symbol.name])
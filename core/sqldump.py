@@ -0,0 +1,102 @@
+import re
+
+# Incremental reader for MySQL/phpMyAdmin dumps. Only INSERT statements are
+# interpreted; everything else is tokenized and skipped. The file is read in
+# fixed-size chunks so memory does not grow with the size of the dump.
+
+TOKEN = re.compile(r"""
+    (?P<comment>--[^\n]*\n|\#[^\n]*\n|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")
+  | (?P<ident>`(?:[^`]|``)*`)
+  | (?P<punct>[(),;])
+  | (?P<word>[^\s'"`(),;]+)
+  | (?P<space>\s+)
+""", re.VERBOSE | re.DOTALL)
+
+ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+ESCAPE = re.compile(r"\\(.)|''|\"\"", re.DOTALL)
+
+def unquote(literal):
+    def replace(match):
+        if match.group(1) is None:
+            return match.group(0)[0]
+        return ESCAPES.get(match.group(1), match.group(1))
+    return ESCAPE.sub(replace, literal[1:-1])
+
+def iter_tokens(stream, chunk_size=1 << 20):
+    buf = ''
+    pos = 0
+    eof = False
+    while True:
+        match = TOKEN.match(buf, pos)
+        # A token touching the end of the buffer, a string followed by its own
+        # quote (a doubled quote cut in half) or a comment whose terminator has
+        # not been read yet may all continue in the next chunk
+        partial = match is None or match.end() == len(buf) or (
+            match.lastgroup == 'string' and buf.startswith(match.group()[0], match.end())
+        ) or (
+            match.lastgroup != 'comment' and buf.startswith(('--', '/*', '#'), pos)
+        )
+        if partial and not eof:
+            chunk = stream.read(chunk_size)
+            buf = buf[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            continue
+        if match is None:
+            if pos < len(buf):
+                raise ValueError(f"Unparseable SQL near: {buf[pos:pos + 40]!r}")
+            return
+        pos = match.end()
+        kind = match.lastgroup
+        if kind not in ('space', 'comment'):
+            yield kind, match.group(kind)
+
+def iter_insert_rows(stream, chunk_size=1 << 20):
+    """Yield ``(table, columns, values)`` for every tuple of every INSERT.
+
+    ``columns`` is ``None`` when the statement has no column list. Strings are
+    unescaped, ``NULL`` becomes ``None`` and other bare values stay as text.
+    """
+    tokens = iter_tokens(stream, chunk_size)
+    for kind, value in tokens:
+        if kind != 'word' or value.upper() != 'INSERT':
+            if kind != 'punct' or value != ';':
+                _skip_statement(tokens)
+            continue
+
+        table = None
+        columns = None
+        for kind, value in tokens:
+            if kind == 'word' and value.upper() in ('VALUES', 'VALUE'):
+                break
+            elif kind == 'ident' and table is None:
+                table = value[1:-1]
+            elif kind == 'word' and table is None and value.upper() not in ('INTO', 'IGNORE', 'LOW_PRIORITY', 'DELAYED', 'HIGH_PRIORITY'):
+                table = value
+            elif kind == 'punct' and value == '(':
+                columns = [ident[1:-1] for k, ident in _until_close(tokens) if k == 'ident']
+
+        for kind, value in tokens:
+            if kind == 'punct' and value == ';':
+                break
+            if kind == 'punct' and value == '(':
+                row = []
+                for k, item in _until_close(tokens):
+                    if k == 'string':
+                        row.append(unquote(item))
+                    elif k == 'word':
+                        row.append(None if item.upper() == 'NULL' else item)
+                yield table, columns, row
+
+def _skip_statement(tokens):
+    for kind, value in tokens:
+        if kind == 'punct' and value == ';':
+            return
+
+def _until_close(tokens):
+    for kind, value in tokens:
+        if kind == 'punct' and value == ')':
+            return
+        if kind != 'punct':
+            yield kind, value
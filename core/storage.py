@@ -0,0 +1,91 @@
+import hashlib
+import os
+import posixpath
+import re
+import time
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+from django.db import models, transaction
+
+# Media is stored under the SHA-256 of its content (in the directory the field
+# uploads to), so the same party symbol uploaded for twenty candidates, or
+# re-uploaded on every edit, is one file. A stored object never changes, so it
+# is served with immutable cache headers (core.views.media).
+#
+# Files are shared between rows, so they are only deleted once no image field
+# references them any more: whenever rows drop files (replaced or deleted, see
+# release_files), the dropped names are looked up in every FileField, one
+# indexed query per field. Keep FileFields indexed (db_index=True) for this.
+
+CONTENT_ADDRESSED_NAME = re.compile(r'[0-9a-f]{64}')
+
+class ContentAddressedStorage(FileSystemStorage):
+    # An object reused by an upload that is not committed yet is not counted as
+    # referenced, so objects touched this recently are never deleted
+    release_grace = 300  # seconds
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(posixpath.dirname(name), digest.hexdigest() + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        if self.exists(name):
+            os.utime(self.path(name))
+        else:
+            name = self._save(name, content)
+        validate_file_name(name, allow_relative_path=True)
+        return name
+
+    def discard(self, name):
+        """Delete an object that no row references any more."""
+        try:
+            if time.time() - os.path.getmtime(self.path(name)) < self.release_grace:
+                return
+        except FileNotFoundError:
+            return
+        self.delete(name)
+
+def referenced(names):
+    """The subset of ``names`` stored by at least one row, across every FileField."""
+    found = set()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                found.update(model._default_manager.filter(**{f'{field.name}__in': names}).values_list(field.name, flat=True).distinct())
+    return found
+
+def release_files(storage, names):
+    """Once the current transaction commits, discard those of ``names`` that are no longer referenced."""
+    names = {name for name in names if name}
+    if not names or not hasattr(storage, 'discard'):
+        return
+
+    def release():
+        for name in names - referenced(names):
+            storage.discard(name)
+    transaction.on_commit(release)
+
+def replaced_files(instance, fields):
+    """Names currently stored for ``fields`` that this save of ``instance`` replaces or clears (call from pre_save)."""
+    if instance.pk is None:
+        return []
+    changing = [field for field in fields if not getattr(instance, field) or not getattr(instance, field)._committed]
+    if not changing:
+        return []
+    old = type(instance)._default_manager.filter(pk=instance.pk).values(*changing).first() or {}
+    return [old[field] for field in changing if old.get(field) and old[field] != getattr(instance, field).name]
+
+def is_content_addressed(path):
+    stem = os.path.splitext(posixpath.basename(path))[0]
+    return bool(CONTENT_ADDRESSED_NAME.fullmatch(stem))
@@ -1,3 +1,92 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+
+class MetricsViewTests(TestCase):
+    @override_settings(METRICS_TOKEN='')
+    def test_refused_without_a_token_outside_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_required_when_set(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+
+class SeedDbTests(TestCase):
+    def test_rows_dumped_before_their_parents_are_not_held(self):
+        # votesystem.sql's order: candidates, then positions, voters and votes
+        from django.core.management import call_command
+        from core.management.commands.seed_db import Command
+        from core.models import Candidate
+        from users.models import Vote
+
+        votes = 40
+        dump = '\n'.join([
+            "INSERT INTO `candidates` (`id`, `position_id`, `firstname`, `lastname`, `photo`, `platform`) VALUES (1, 1, 'A', 'One', '', ''), (2, 1, 'B', 'Two', '', '');",
+            "INSERT INTO `positions` (`id`, `description`, `max_vote`, `priority`) VALUES (1, 'President', 1, 1);",
+            "INSERT INTO `voters` (`id`, `voters_id`, `password`, `firstname`, `lastname`, `photo`) VALUES "
+            + ', '.join(f"({n}, 'V{n}', 'x', 'Voter', '{n}', '')" for n in range(1, votes + 1)) + ';',
+            "INSERT INTO `votes` (`id`, `voters_id`, `candidate_id`, `position_id`) VALUES "
+            + ', '.join(f"({n}, {n}, {n % 2 + 1}, 1)" for n in range(1, votes + 1)) + ';',
+        ])
+        held = []
+
+        class Recording(Command):
+            def add_fields(self, table, fields):
+                super().add_fields(table, fields)
+                held.append(sum(len(rows) for rows in self.pending.values()))
+
+        with tempfile.NamedTemporaryFile('w', suffix='.sql', delete=False) as f:
+            f.write(dump)
+        self.addCleanup(os.remove, f.name)
+        call_command(Recording(), file=f.name, batch_size=5, stdout=io.StringIO())
+
+        self.assertEqual((Candidate.objects.count(), Vote.objects.count()), (2, votes))
+        self.assertLess(max(held), 5)
+
+
+class StorageReferenceTests(TestCase):
+    def test_dropped_names_are_looked_up_once_per_file_field(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from core.models import Candidate, Election, Position
+        from core.storage import referenced
+
+        election = Election.objects.create(title='Election')
+        position = Position.objects.create(election=election, description='President', max_vote=1, priority=1)
+        Candidate.objects.create(election=election, position=position, firstname='A', lastname='One',
+                                 photo='candidates/photos/shared.png', symbol='candidates/symbols/party.png')
+        names = ['candidates/photos/shared.png', 'candidates/symbols/party.png', 'voters/gone.png']
+        with CaptureQueriesContext(connection) as queries:
+            found = referenced(names)
+        self.assertEqual(found, {'candidates/photos/shared.png', 'candidates/symbols/party.png'})
+        # Voter.photo, Candidate.photo and Candidate.symbol, each an indexed lookup
+        self.assertEqual(len(queries), 3)
+        for query in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                self.assertIn('INDEX', ' '.join(str(row) for row in cursor.fetchall()))
+
+
+class CurrentElectionTests(TestCase):
+    def test_new_election_seen_without_this_process_being_told(self):
+        from django.core.cache import cache
+        from core.ballot import get_ballot
+        from core.elections import current_election_id
+        from core.models import Election, Position
+
+        cache.clear()
+        old = current_election_id()
+        Position.objects.create(election_id=old, description='President', max_vote=1, priority=1)
+        self.assertIn('President', get_ballot()['body'])
+
+        # Another worker process starts a new election; election_changed never runs here
+        Election.objects.filter(pk=old).update(status='archived')
+        new = Election.objects.create(title='Next').pk
+        self.assertEqual(current_election_id(), new)
+        self.assertNotIn('President', get_ballot()['body'])
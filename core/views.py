@@ -1,3 +1,29 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.static import serve
+from . import metrics
+from .storage import is_content_addressed
 
-# Create your views here.
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+def media(request, path):
+    """Serve MEDIA_ROOT; content-addressed files never change, so clients may cache them for good."""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if is_content_addressed(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, behind `Authorization: Bearer <METRICS_TOKEN>`.
+
+    Without a METRICS_TOKEN it is only served while DEBUG is on.
+    """
+    if not settings.METRICS_TOKEN:
+        if not settings.DEBUG:
+            return HttpResponse('Set METRICS_TOKEN to enable /metrics', status=403, content_type='text/plain')
+    elif not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {settings.METRICS_TOKEN}'
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'evoting.settings')
 
 application = get_asgi_application()
+
+# Replay ballots left in the ballot log (VOTE_LOG_DIR) by a crash before serving
+from users.writer import writer  # noqa: E402
+writer.start()
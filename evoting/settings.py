@@ -49,7 +49,10 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.common.CommonMiddleware',
@@ -83,10 +86,40 @@ WSGI_APPLICATION = 'evoting.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# evoting.sqlite is the stock SQLite backend plus per-connection PRAGMAS and
+# BEGIN IMMEDIATE transactions (evoting/sqlite/base.py). WAL lets readers run
+# during writes; synchronous=NORMAL is crash-safe in WAL mode but may drop the
+# last commits on power loss - use FULL if that matters more than write latency.
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'evoting.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'TRANSACTION_MODE': 'IMMEDIATE',
+        # A file, not the default shared-cache in-memory database: that one uses
+        # table locks that ignore busy_timeout, so concurrent tests/loadtests fail
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+            'busy_timeout': 5000,  # ms
+            'cache_size': -64000,  # KiB, i.e. 64 MB
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The pre-rendered ballot lives here. Point this at Redis/Memcached when running
+# several worker processes so invalidation reaches all of them.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'evoting',
     }
 }
 
@@ -137,5 +170,110 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CRISPY_TEMPLATE_PACK = 'bootstrap3'
 
+# Logging: the project's own loggers (core.*, users.*) report to stderr,
+# including failures in the background threads (vote writer, ballot log,
+# image variants, purges) that no request is waiting on.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core': {'handlers': ['console'], 'level': 'INFO'},
+        'users': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Uploads are stored by content hash and shared between rows (core/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Image variants (core/images.py)
+# Photos and symbols are served as these resized, metadata-free copies under
+# MEDIA_ROOT/variants/. Their names are content hashes, so they can be served
+# with far-future cache headers.
+
+IMAGE_VARIANTS = {'thumb': 64, 'card': 320}  # longest side in pixels
+IMAGE_VARIANT_FORMAT = 'WEBP'  # or 'JPEG'
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_POOL_WORKERS = 2
+
+# API responses
+# JSON is rendered with orjson when installed (core/renderers.py); responses of
+# COMPRESSION_MIN_SIZE bytes or more are sent gzipped, or Brotli-compressed if
+# the optional brotli package is installed (core/middleware.py).
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+COMPRESSION_MIN_SIZE = 1024  # bytes
+BROTLI_QUALITY = 5  # 0-11; higher is smaller but much slower to compress
+
+# Prometheus metrics at /metrics (core/metrics.py). Scrapes must send
+# "Authorization: Bearer <METRICS_TOKEN>". Left empty, /metrics is public while
+# DEBUG is on and refused (403) otherwise.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# On-demand profiles (core/profiling.py): requests sent with an admin token in
+# X-Profile-Token are profiled and kept here, newest PROFILE_MAX_KEPT only
+PROFILE_DIR = os.environ.get('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_MAX_KEPT = 50
+
+# Slow-query log (core/querylog.py), viewable at api/admin/slow-queries/
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))  # statements at least this slow are kept
+SLOW_QUERY_LOG_SIZE = 500  # entries, oldest dropped first
+
+# Password hashing pool (users/hashing.py)
+# bcrypt runs in a bounded pool; once BCRYPT_POOL_MAX_PENDING jobs are queued,
+# logins/voter saves are answered with 503 + Retry-After instead of piling up.
+
+BCRYPT_POOL_KIND = os.environ.get('BCRYPT_POOL_KIND', 'thread')  # 'thread' or 'process'
+BCRYPT_POOL_WORKERS = int(os.environ.get('BCRYPT_POOL_WORKERS', os.cpu_count() or 2))
+BCRYPT_POOL_MAX_PENDING = int(os.environ.get('BCRYPT_POOL_MAX_PENDING', 64))
+BCRYPT_RETRY_AFTER = 1
+
+# Voter roll uploads (users/importer.py) are imported in a background thread
+# and polled at api/admin/voters/import/<id>/; their passwords are hashed in
+# the pool above, at most BCRYPT_POOL_WORKERS // 2 at a time.
+VOTER_IMPORT_THREADED = True  # False imports in the request itself (tests, debugging)
+
+# Live dashboard tally stream (users/live.py)
+
+TALLY_PUSH_INTERVAL = 0.5  # seconds between pushed updates, at most
+TALLY_PUSH_IDLE_POLL = 5  # seconds between tally reads when no local vote woke the stream
+TALLY_PUSH_QUEUE_SIZE = 32
+
+# Signed session tokens (users/tokens.py)
+# Tokens are checked without a database lookup; logouts, deleted accounts and
+# vote resets are tracked in the cache, so run multi-process deployments with a
+# shared cache backend (e.g. Redis) rather than the per-process LocMemCache.
+
+VOTER_TOKEN_MAX_AGE = 2 * 60 * 60  # seconds
+ADMIN_TOKEN_MAX_AGE = 8 * 60 * 60
+
+# Vote writer (users/writer.py)
+# Ballots are written by one thread per process, many per transaction.
+
+VOTE_WRITER_THREADED = True  # False writes each ballot in the request itself (tests, debugging)
+VOTE_WRITER_MAX_BATCH = 500  # ballots per transaction, at most
+VOTE_WRITER_TIMEOUT = 30  # seconds a request waits for its ballot to be written
+VOTE_DRAIN_TIMEOUT = 30  # seconds an election reset waits for logged ballots before answering 503
+
+# Ballot log (users/ballotlog.py): when set, ballots are acknowledged once
+# fsynced to an append-only log in this directory and applied to the database
+# in the background. Single worker process only - the directory is locked.
+
+VOTE_LOG_DIR = os.environ.get('VOTE_LOG_DIR')
+VOTE_LOG_APPLY_BATCH = 5000  # ballots per database transaction, at most
+VOTE_LOG_APPLY_ATTEMPTS = 5  # tries per ballot before it is moved to ballots.rejected
+VOTE_LOG_COMPACT_BYTES = 64 * 1024 * 1024  # truncate the log once this big and fully applied
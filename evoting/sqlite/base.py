@@ -0,0 +1,18 @@
+from django.db.backends.sqlite3 import base
+
+# SQLite tuned for a single production node. Set as the ENGINE in DATABASES;
+# every new connection applies the PRAGMAS from the settings entry, and
+# BEGIN IMMEDIATE (TRANSACTION_MODE) takes the write lock up front so
+# concurrent writers wait on busy_timeout instead of failing with
+# "database is locked" when a read transaction tries to upgrade.
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, value in self.settings_dict.get('PRAGMAS', {}).items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE')
+        self.cursor().execute(f"BEGIN {mode}" if mode else "BEGIN")
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'evoting.settings')
 
 application = get_wsgi_application()
+
+# Replay ballots left in the ballot log (VOTE_LOG_DIR) by a crash before serving
+from users.writer import writer  # noqa: E402
+writer.start()
@@ -3,6 +3,8 @@ import axios from 'axios'
 import { useNavigate } from 'react-router-dom'
 import DashboardLayout from './DashboardLayout'
 
+// How often the stats are re-fetched when the live stream is unavailable (ms)
+const STATS_POLL_INTERVAL = 5000
 
 function AdminDashboard() {
   const [stats, setStats] = useState({
@@ -81,6 +83,43 @@ function AdminDashboard() {
     }
 
     fetchStats()
+
+    // 4. Live updates: the server pushes changed vote counts (needs the ASGI server).
+    // Without it the stream is refused and closed for good, so poll the stats instead;
+    // a dropped connection (still CONNECTING) is retried by the browser.
+    let poll = null
+    const source = new EventSource(`http://127.0.0.1:8000/api/admin/stats/stream/?token=${encodeURIComponent(token)}`)
+    source.addEventListener('tally', (event) => {
+      const update = JSON.parse(event.data)
+      setStats(prev => {
+        if (prev.election && prev.election.id !== update.election) {
+          // A new election was started: reload its positions instead of patching
+          fetchStats()
+          return prev
+        }
+        return {
+          ...prev,
+          summary: { ...prev.summary, votes_cast: update.votes_cast },
+          tally: prev.tally.map(pos => ({
+            ...pos,
+            candidates: pos.candidates
+              .map(cand => cand.id in update.candidates ? { ...cand, votes: update.candidates[cand.id] } : cand)
+              .sort((a, b) => b.votes - a.votes)
+          }))
+        }
+      })
+    })
+
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED && !poll) {
+        poll = setInterval(fetchStats, STATS_POLL_INTERVAL)
+      }
+    }
+
+    return () => {
+      source.close()
+      clearInterval(poll)
+    }
   }, [navigate])
 
   const getMaxVotes = (candidates) => {
@@ -1,5 +1,6 @@
 import { useState, useEffect, lazy, Suspense } from 'react'
 import { BrowserRouter, Routes, Route, Navigate, useLocation } from 'react-router-dom'
+import axios from 'axios'
 
 // Lazy Load Components
 const Login = lazy(() => import('./Login'))
@@ -42,6 +43,9 @@ const InnerApp = ({ token, setToken, user, setUser }) => {
   const location = useLocation(); // Now safe to use
 
   const handleLogout = () => {
+      if (token) {
+          axios.post('http://127.0.0.1:8000/api/logout/', { token }).catch(() => {})
+      }
       setToken('')
       setUser(null)
       localStorage.removeItem('token')
@@ -55,7 +59,7 @@ const InnerApp = ({ token, setToken, user, setUser }) => {
         <Suspense fallback={<LoadingSpinner />}>
           <Routes>
             <Route path="/" element={<Login setToken={setToken} setUser={setUser} />} />
-            <Route path="/home" element={<Home token={token} user={user} handleLogout={handleLogout} />} />
+            <Route path="/home" element={<Home token={token} setToken={setToken} user={user} handleLogout={handleLogout} />} />
             <Route path="/admin-login" element={<AdminLogin />} />
             <Route path="/admin-dashboard" element={<AdminDashboard />} />
             <Route path="/votes" element={<Votes />} />
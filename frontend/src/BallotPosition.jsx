@@ -22,7 +22,8 @@ function BallotPosition() {
   const fetchPositions = async () => {
     try {
       const response = await axios.get('http://127.0.0.1:8000/api/admin/positions/', {
-        headers: { 'Authorization': `Token ${token}` }
+        headers: { 'Authorization': `Token ${token}` },
+        params: { candidates: 'none' }
       })
       // Sort by priority ASC (1 shows first, etc.) - or however backend sends it
       // Let's assume we want to control the order.
@@ -6,6 +6,11 @@ import DashboardLayout from './DashboardLayout'
 
 function Candidates() {
   const [candidates, setCandidates] = useState([])
+  const [page, setPage] = useState(1)
+  const [totalCount, setTotalCount] = useState(0)
+  const [hasNext, setHasNext] = useState(false)
+  const [search, setSearch] = useState('')
+  const [positionFilter, setPositionFilter] = useState('')
   const [positions, setPositions] = useState([])
   const [loading, setLoading] = useState(true)
 
@@ -39,18 +44,22 @@ function Candidates() {
       navigate('/admin-login')
       return
     }
-    fetchCandidates()
-    fetchPositions()
-
     fetchPositions()
   }, [navigate, token])
 
+  useEffect(() => {
+    if (token) fetchCandidates()
+  }, [token, page, positionFilter])
+
   const fetchCandidates = async () => {
     try {
       const response = await axios.get('http://127.0.0.1:8000/api/admin/candidates/', {
-        headers: { 'Authorization': `Token ${token}` }
+        headers: { 'Authorization': `Token ${token}` },
+        params: { page, ...(search ? { search } : {}), ...(positionFilter ? { position: positionFilter } : {}) }
       })
-      setCandidates(response.data)
+      setCandidates(response.data.results)
+      setTotalCount(response.data.count)
+      setHasNext(Boolean(response.data.next))
     } catch (err) {
         console.error("Error fetching candidates", err)
         if (err.response && err.response.status === 401) {
@@ -65,7 +74,8 @@ function Candidates() {
   const fetchPositions = async () => {
       try {
           const response = await axios.get('http://127.0.0.1:8000/api/admin/positions/', {
-            headers: { 'Authorization': `Token ${token}` }
+            headers: { 'Authorization': `Token ${token}` },
+            params: { candidates: 'none' }
           })
           setPositions(response.data)
       } catch (err) {
@@ -194,6 +204,26 @@ function Candidates() {
                 <a href="#addnew" onClick={(e) => {e.preventDefault(); openAddModal()}} className="px-4 py-2 bg-indigo-600 hover:bg-indigo-500 text-white rounded-lg text-sm font-medium transition-colors flex items-center gap-2 shadow-lg shadow-indigo-500/20">
                     <i className="fa fa-plus"></i> New Candidate
                 </a>
+                <form onSubmit={(e) => { e.preventDefault(); page === 1 ? fetchCandidates() : setPage(1) }} className="flex items-center gap-2">
+                    <select
+                        value={positionFilter}
+                        onChange={(e) => { setPositionFilter(e.target.value); setPage(1) }}
+                        className="px-3 py-2 bg-slate-950 border border-slate-700 rounded-lg text-sm text-slate-200 focus:outline-none focus:border-indigo-500"
+                    >
+                        <option value="">All Positions</option>
+                        {positions.map(pos => (
+                            <option key={pos.id} value={pos.id}>{pos.description}</option>
+                        ))}
+                    </select>
+                    <input
+                        type="text"
+                        value={search}
+                        onChange={(e) => setSearch(e.target.value)}
+                        placeholder="Search ID / Name / Party"
+                        className="px-3 py-2 bg-slate-950 border border-slate-700 rounded-lg text-sm text-slate-200 focus:outline-none focus:border-indigo-500"
+                    />
+                    <button type="submit" className="px-3 py-2 bg-slate-800 hover:bg-slate-700 text-slate-200 rounded-lg text-sm transition-colors"><i className="fa fa-search"></i></button>
+                </form>
              </div>
              
             <div className="overflow-x-auto">
@@ -232,13 +262,13 @@ function Candidates() {
                                 <td className="px-6 py-4">{cand.gender}</td>
                                 <td className="px-6 py-4">
                                     <img 
-                                        src={cand.photo ? `http://127.0.0.1:8000${cand.photo}` : `https://ui-avatars.com/api/?name=${cand.firstname}+${cand.lastname}`} 
+                                        src={cand.photo_variants ? `http://127.0.0.1:8000${cand.photo_variants.thumb}` : `https://ui-avatars.com/api/?name=${cand.firstname}+${cand.lastname}`} 
                                         className="w-10 h-10 rounded-full border border-slate-600 object-cover" 
                                         alt="Candidate"
                                     />
                                 </td>
                                 <td className="px-6 py-4">
-                                    {cand.symbol && <img src={`http://127.0.0.1:8000${cand.symbol}`} className="w-10 h-10 object-contain rounded bg-white/5 p-1" alt="Symbol" />}
+                                    {cand.symbol_variants && <img src={`http://127.0.0.1:8000${cand.symbol_variants.thumb}`} className="w-10 h-10 object-contain rounded bg-white/5 p-1" alt="Symbol" />}
                                 </td>
                                 <td className="px-6 py-4 text-xs max-w-xs truncate text-slate-400">
                                     {cand.manifesto ? (cand.manifesto.length > 50 ? cand.manifesto.substring(0, 50) + "..." : cand.manifesto) : <em>-</em>}
@@ -255,6 +285,14 @@ function Candidates() {
                     </tbody>
                 </table>
             </div>
+            <div className="p-4 border-t border-slate-800 flex justify-between items-center text-sm text-slate-400">
+                <span>{totalCount} candidates</span>
+                <div className="flex items-center gap-2">
+                    <button disabled={page === 1} onClick={() => setPage(page - 1)} className="px-3 py-1.5 bg-slate-800 hover:bg-slate-700 text-slate-200 rounded disabled:opacity-40 transition-colors">Prev</button>
+                    <span>Page {page}</span>
+                    <button disabled={!hasNext} onClick={() => setPage(page + 1)} className="px-3 py-1.5 bg-slate-800 hover:bg-slate-700 text-slate-200 rounded disabled:opacity-40 transition-colors">Next</button>
+                </div>
+            </div>
         </section>
 
         {/* Modal */}
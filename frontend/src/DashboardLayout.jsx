@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useNavigate, useLocation, Link } from 'react-router-dom';
+import axios from 'axios';
 import Sidebar from './Sidebar';
 
 function DashboardLayout({ children, title, subTitle = "Control Panel", loading = false }) {
@@ -20,6 +21,12 @@ function DashboardLayout({ children, title, subTitle = "Control Panel", loading
     };
 
     const handleLogout = () => {
+        const token = localStorage.getItem('admin_token');
+        if (token) {
+            axios.post('http://127.0.0.1:8000/api/logout/', {}, {
+                headers: { 'Authorization': `Token ${token}` }
+            }).catch(() => {});
+        }
         localStorage.removeItem('admin_token');
         navigate('/admin-login');
     };
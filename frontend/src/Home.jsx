@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react'
 import axios from 'axios'
 import { useNavigate } from 'react-router-dom'
 
-function Home({ token, user, handleLogout }) {
+function Home({ token, setToken, user, handleLogout }) {
   const [positions, setPositions] = useState([])
   const [alreadyVoted, setAlreadyVoted] = useState(false)
   const [electionTitle, setElectionTitle] = useState('')
@@ -22,7 +22,7 @@ function Home({ token, user, handleLogout }) {
 
   const fetchBallot = async () => {
     try {
-      const response = await axios.get(`http://127.0.0.1:8000/api/ballot/?token=${token}`)
+      const response = await axios.get('http://127.0.0.1:8000/api/ballot/', { params: { token } })
       setPositions(response.data.positions)
       setAlreadyVoted(response.data.already_voted)
       setElectionTitle(response.data.election_title)
@@ -78,12 +78,14 @@ function Home({ token, user, handleLogout }) {
 
   const handleSubmit = async () => {
     try {
-        await axios.post('http://127.0.0.1:8000/api/vote/', {
+        const response = await axios.post('http://127.0.0.1:8000/api/vote/', {
             token: token,
             votes: votes
         })
         setModalOpen(false)
-        fetchBallot() // This will trigger the "already voted" view
+        // The new token records that we voted; storing it refetches the ballot ("already voted" view)
+        localStorage.setItem('token', response.data.token)
+        setToken(response.data.token)
     } catch (err) {
         alert(err.response?.data?.error || 'Submission failed')
     }
@@ -212,7 +214,7 @@ function Home({ token, user, handleLogout }) {
                                     {/* Image Aspect Ratio Container */}
                                     <div className="aspect-square w-full overflow-hidden bg-slate-950 relative">
                                         <img 
-                                            src={candidate.photo ? `http://127.0.0.1:8000${candidate.photo}` : `https://ui-avatars.com/api/?name=${candidate.firstname}+${candidate.lastname}`} 
+                                            src={candidate.photo_variants ? `http://127.0.0.1:8000${candidate.photo_variants.card}` : `https://ui-avatars.com/api/?name=${candidate.firstname}+${candidate.lastname}`} 
                                             alt={`${candidate.firstname} ${candidate.lastname}`}
                                             className={`w-full h-full object-cover transition-transform duration-500 ${selected ? 'scale-110' : 'group-hover:scale-105'}`}
                                         />
@@ -35,7 +35,8 @@ function Positions() {
   const fetchPositions = async () => {
     try {
       const response = await axios.get('http://127.0.0.1:8000/api/admin/positions/', {
-        headers: { 'Authorization': `Token ${token}` }
+        headers: { 'Authorization': `Token ${token}` },
+        params: { candidates: 'count' }
       })
       setPositions(response.data)
     } catch (err) {
@@ -132,6 +133,7 @@ function Positions() {
                             <th className="px-6 py-4 font-semibold tracking-wider">Description</th>
                             <th className="px-6 py-4 font-semibold tracking-wider">Max Vote</th>
                             <th className="px-6 py-4 font-semibold tracking-wider">Priority</th>
+                            <th className="px-6 py-4 font-semibold tracking-wider">Candidates</th>
                             <th className="px-6 py-4 font-semibold tracking-wider text-right">Tools</th>
                         </tr>
                     </thead>
@@ -141,6 +143,7 @@ function Positions() {
                                 <td className="px-6 py-4 font-medium text-white">{pos.description}</td>
                                 <td className="px-6 py-4">{pos.max_vote}</td>
                                 <td className="px-6 py-4">{pos.priority}</td>
+                                <td className="px-6 py-4">{pos.candidate_count}</td>
                                 <td className="px-6 py-4 text-right space-x-2 whitespace-nowrap">
                                     <button onClick={() => openEditModal(pos)} className="px-3 py-1.5 bg-emerald-600/20 hover:bg-emerald-600/30 text-emerald-400 rounded text-xs font-medium transition-colors border border-emerald-600/30"><i className="fa fa-edit"></i> Edit</button>
                                     <button onClick={() => handleDelete(pos.id)} className="px-3 py-1.5 bg-rose-600/20 hover:bg-rose-600/30 text-rose-400 rounded text-xs font-medium transition-colors border border-rose-600/30"><i className="fa fa-trash"></i> Delete</button>
@@ -148,7 +151,7 @@ function Positions() {
                             </tr>
                         ))}
                         {positions.length === 0 && !loading && (
-                            <tr><td colSpan="4" className="px-6 py-8 text-center text-slate-500 italic">No positions found.</td></tr>
+                            <tr><td colSpan="5" className="px-6 py-8 text-center text-slate-500 italic">No positions found.</td></tr>
                         )}
                     </tbody>
                 </table>
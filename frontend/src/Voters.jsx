@@ -7,6 +7,10 @@ import DashboardLayout from './DashboardLayout'
 
 function Voters() {
   const [voters, setVoters] = useState([])
+  const [page, setPage] = useState(1)
+  const [totalCount, setTotalCount] = useState(0)
+  const [hasNext, setHasNext] = useState(false)
+  const [search, setSearch] = useState('')
   const [loading, setLoading] = useState(true)
   const [showModal, setShowModal] = useState(false)
   const [editMode, setEditMode] = useState(false)
@@ -37,14 +41,17 @@ function Voters() {
       return
     }
     fetchVoters()
-  }, [navigate, token])
+  }, [navigate, token, page])
 
   const fetchVoters = async () => {
     try {
       const response = await axios.get('http://127.0.0.1:8000/api/admin/voters/', {
-        headers: { 'Authorization': `Token ${token}` }
+        headers: { 'Authorization': `Token ${token}` },
+        params: { page, ...(search ? { search } : {}) }
       })
-      setVoters(response.data)
+      setVoters(response.data.results)
+      setTotalCount(response.data.count)
+      setHasNext(Boolean(response.data.next))
     } catch (err) {
       console.error("Error fetching voters", err)
       if (err.response && err.response.status === 401) {
@@ -212,6 +219,16 @@ function Voters() {
                 <a href="#addnew" onClick={(e) => {e.preventDefault(); openAddModal()}} className="px-4 py-2 bg-indigo-600 hover:bg-indigo-500 text-white rounded-lg text-sm font-medium transition-colors flex items-center gap-2 shadow-lg shadow-indigo-500/20">
                     <i className="fa fa-plus"></i> New Voter
                 </a>
+                <form onSubmit={(e) => { e.preventDefault(); page === 1 ? fetchVoters() : setPage(1) }} className="flex items-center gap-2">
+                    <input
+                        type="text"
+                        value={search}
+                        onChange={(e) => setSearch(e.target.value)}
+                        placeholder="Search Voter ID / Name"
+                        className="px-3 py-2 bg-slate-950 border border-slate-700 rounded-lg text-sm text-slate-200 focus:outline-none focus:border-indigo-500"
+                    />
+                    <button type="submit" className="px-3 py-2 bg-slate-800 hover:bg-slate-700 text-slate-200 rounded-lg text-sm transition-colors"><i className="fa fa-search"></i></button>
+                </form>
              </div>
              
             <div className="overflow-x-auto">
@@ -257,7 +274,7 @@ function Voters() {
                                 </td>
                                 <td className="px-6 py-4">
                                     <img 
-                                        src={voter.photo ? `http://127.0.0.1:8000${voter.photo}` : `https://ui-avatars.com/api/?name=${voter.firstname}+${voter.lastname}`} 
+                                        src={voter.photo_variants ? `http://127.0.0.1:8000${voter.photo_variants.thumb}` : `https://ui-avatars.com/api/?name=${voter.firstname}+${voter.lastname}`} 
                                         width="30" height="30" 
                                         className="rounded-full ring-2 ring-slate-700"
                                         alt="Voter"
@@ -275,6 +292,14 @@ function Voters() {
                     </tbody>
                 </table>
             </div>
+            <div className="p-4 border-t border-slate-800 flex justify-between items-center text-sm text-slate-400">
+                <span>{totalCount} voters</span>
+                <div className="flex items-center gap-2">
+                    <button disabled={page === 1} onClick={() => setPage(page - 1)} className="px-3 py-1.5 bg-slate-800 hover:bg-slate-700 text-slate-200 rounded disabled:opacity-40 transition-colors">Prev</button>
+                    <span>Page {page}</span>
+                    <button disabled={!hasNext} onClick={() => setPage(page + 1)} className="px-3 py-1.5 bg-slate-800 hover:bg-slate-700 text-slate-200 rounded disabled:opacity-40 transition-colors">Next</button>
+                </div>
+            </div>
         </section>
 
       {/* Modal */}
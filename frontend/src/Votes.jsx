@@ -7,6 +7,7 @@ import DashboardLayout from './DashboardLayout'
 
 function Votes() {
   const [votes, setVotes] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
   const navigate = useNavigate()
   const token = localStorage.getItem('admin_token')
@@ -19,12 +20,14 @@ function Votes() {
     fetchVotes()
   }, [navigate, token])
 
-  const fetchVotes = async () => {
+  const fetchVotes = async (cursor = null) => {
     try {
       const response = await axios.get('http://127.0.0.1:8000/api/admin/votes/', {
-        headers: { 'Authorization': `Token ${token}` }
+        headers: { 'Authorization': `Token ${token}` },
+        params: cursor ? { cursor } : {}
       })
-      setVotes(response.data)
+      setVotes(prev => cursor ? [...prev, ...response.data.results] : response.data.results)
+      setNextCursor(response.data.next)
     } catch (err) {
       console.error("Error fetching votes", err)
       if (err.response && err.response.status === 401) {
@@ -36,14 +39,34 @@ function Votes() {
     }
   }
 
+  // A plain link cannot send the Authorization header, so download through axios
+  const handleExport = async () => {
+      try {
+          const response = await axios.get('http://127.0.0.1:8000/api/admin/votes/', {
+            headers: { 'Authorization': `Token ${token}` },
+            params: { export: 'csv' },
+            responseType: 'blob'
+          })
+          const url = URL.createObjectURL(response.data)
+          const link = document.createElement('a')
+          link.href = url
+          link.download = 'votes.csv'
+          link.click()
+          URL.revokeObjectURL(url)
+      } catch(err) {
+          console.error("Export failed", err);
+          alert("Failed to export votes.");
+      }
+  }
+
   const handleResetVotes = async () => {
-      if(!window.confirm("WARNING: This will delete ALL votes. This action cannot be undone. Are you sure?")) return;
+      if(!window.confirm("This will close the current election and start a new one with the same positions and candidates. The current votes are archived. Continue?")) return;
       
       try {
           await axios.post('http://127.0.0.1:8000/api/admin/votes/reset/', {}, {
             headers: { 'Authorization': `Token ${token}` }
           })
-          alert("All votes have been reset.");
+          alert("A new election has been started.");
           fetchVotes();
       } catch(err) {
           console.error("Reset failed", err);
@@ -56,9 +79,14 @@ function Votes() {
         <section className="bg-slate-900 rounded-xl border border-slate-800 shadow-sm overflow-hidden animate-fade-in">
              <div className="p-4 border-b border-slate-800 flex justify-between items-center bg-slate-800/50">
                 <h3 className="text-lg font-semibold text-white">All Votes</h3>
-                <button onClick={handleResetVotes} className="px-4 py-2 bg-rose-600 hover:bg-rose-500 text-white rounded-lg text-sm font-medium transition-colors flex items-center gap-2 shadow-lg shadow-rose-500/20">
-                    <i className="fa fa-refresh"></i> Reset Votes
-                </button>
+                <div className="flex items-center gap-2">
+                    <button onClick={handleExport} className="px-4 py-2 bg-emerald-600 hover:bg-emerald-500 text-white rounded-lg text-sm font-medium transition-colors flex items-center gap-2 shadow-sm">
+                        <i className="fa fa-download"></i> Export CSV
+                    </button>
+                    <button onClick={handleResetVotes} className="px-4 py-2 bg-rose-600 hover:bg-rose-500 text-white rounded-lg text-sm font-medium transition-colors flex items-center gap-2 shadow-lg shadow-rose-500/20">
+                        <i className="fa fa-refresh"></i> Reset Votes
+                    </button>
+                </div>
              </div>
              
             <div className="overflow-x-auto">
@@ -96,6 +124,13 @@ function Votes() {
                     </tbody>
                 </table>
             </div>
+            {nextCursor && (
+                <div className="p-4 border-t border-slate-800 flex justify-center">
+                    <button onClick={() => fetchVotes(nextCursor)} className="px-4 py-2 bg-slate-800 hover:bg-slate-700 text-slate-200 rounded-lg text-sm font-medium transition-colors">
+                        Load More
+                    </button>
+                </div>
+            )}
         </section>
     </DashboardLayout>
   )
@@ -1,84 +1,194 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
-from django.db import models
-from .models import Voter, Vote
-from core.models import Position, Candidate, Title
-from core.serializers import PositionSerializer, CandidateSerializer, TitleSerializer
-import bcrypt
+from django.db import models, transaction
+from .models import Voter, Vote, VoterBallotReceipt, VoterImportJob, PositionTally
+from . import tally
+from core.models import Election, Position, Candidate, Title
+from core.elections import PURGEABLE_STATUSES, current_election_id, start_election, purge_election
+from core.serializers import ElectionSerializer, PositionSerializer, PositionSummarySerializer, CandidateSerializer, TitleSerializer
+from core.ballot import get_ballot
+from core.images import variant_url
+from core.metrics import login_failures
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from . import hashing, live, tokens
+from .authentication import AdminTokenAuthentication, IsElectionAdmin
+from .writer import writer, ACCEPTED, ALREADY_VOTED, IN_FLIGHT, REJECTED
+from asgiref.sync import sync_to_async
+import asyncio
+import json
+import logging
 
-@api_view(['POST'])
-def api_login(request):
-    voter_id = request.data.get('voter_id')
-    password = request.data.get('password')
+logger = logging.getLogger(__name__)
+
+SSE_HEARTBEAT = 15
+
+def busy_response(response_class):
+    return response_class(
+        {'error': 'Server busy, please retry shortly'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': str(settings.BCRYPT_RETRY_AFTER)}
+    )
+
+# Async so that, under ASGI (evoting/asgi.py), waiting on bcrypt in the hashing
+# pool does not hold a worker thread. Plain Django view: DRF's api_view is sync-only.
+@csrf_exempt
+@require_POST
+async def api_login(request):
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+    except ValueError:
+        return JsonResponse({'error': 'Invalid request body'}, status=status.HTTP_400_BAD_REQUEST)
+    voter_id = data.get('voter_id')
+    password = data.get('password')
     
     try:
-        # Case-insensitive lookup for convenience
-        voter = Voter.objects.get(voters_id__iexact=voter_id)
+        election_id = await sync_to_async(current_election_id)()
+        # Case-insensitive lookup for convenience (matches the Upper(voters_id) index)
+        voter = await Voter.objects.alias(voters_id_upper=Upper('voters_id')).annotate(
+            has_voted=models.Exists(VoterBallotReceipt.objects.filter(voter=models.OuterRef('pk'), election_id=election_id))
+        ).aget(voters_id_upper=str(voter_id).upper())
         
         # Verify password (hashed)
         # Note: Empty password in DB should not match anything
         if not voter.password:
-             return Response({'error': 'Account not fully set up (no password). Please contact admin.'}, status=status.HTTP_400_BAD_REQUEST)
+             login_failures.inc(('no_password',))
+             return JsonResponse({'error': 'Account not fully set up (no password). Please contact admin.'}, status=status.HTTP_400_BAD_REQUEST)
              
-        if bcrypt.checkpw(password.encode('utf-8'), voter.password.encode('utf-8')):
-            return Response({'token': voter.id, 'user': {'firstname': voter.firstname, 'lastname': voter.lastname, 'photo': voter.photo.url if voter.photo else None}})
+        if await hashing.acheck_password(password, voter.password):
+            token = tokens.issue(voter.id, tokens.VOTER, voted_in=election_id if voter.has_voted else None)
+            return JsonResponse({'token': token, 'user': {'firstname': voter.firstname, 'lastname': voter.lastname, 'photo': variant_url(voter.photo.name, voter.photo_variants, 'thumb')}})
         else:
-            return Response({'error': 'Incorrect password'}, status=status.HTTP_400_BAD_REQUEST)
+            login_failures.inc(('wrong_password',))
+            return JsonResponse({'error': 'Incorrect password'}, status=status.HTTP_400_BAD_REQUEST)
     except Voter.DoesNotExist:
-         return Response({'error': 'Voter ID not found'}, status=status.HTTP_404_NOT_FOUND)
-    except Exception as e:
+         login_failures.inc(('unknown_voter',))
+         return JsonResponse({'error': 'Voter ID not found'}, status=status.HTTP_404_NOT_FOUND)
+    except hashing.HashingPoolBusy:
+        login_failures.inc(('busy',))
+        return busy_response(JsonResponse)
+    except Exception:
         # Catch bcrypt errors or other issues
-        print(f"Login Error: {e}")
-        return Response({'error': 'Login error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.exception("Login failed")
+        login_failures.inc(('error',))
+        return JsonResponse({'error': 'Login error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
 def api_ballot(request):
-    voter_id = request.query_params.get('token')
-    if not voter_id:
+    claims = tokens.verify(request.query_params.get('token'), tokens.VOTER)
+    if not claims:
         return Response({'error': 'Unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
         
-    positions = Position.objects.prefetch_related('candidates').order_by('priority')
-    serializer = PositionSerializer(positions, many=True)
+    # A token issued after voting answers this without a query
+    has_voted = tokens.has_voted_hint(claims) or VoterBallotReceipt.objects.filter(
+        voter_id=claims['s'], election_id=current_election_id()
+    ).exists()
     
-    # Get Election Title
-    title_obj = Title.objects.first()
-    election_title = title_obj.header if title_obj else "Secure Aadhaar-Based E-Voting System"
-    
-    has_voted = Vote.objects.filter(voter_id=voter_id).exists()
-    
-    return Response({
-        'positions': serializer.data, 
-        'already_voted': has_voted,
-        'election_title': election_title
-    })
+    # Positions/candidates/title come pre-rendered from the cache (core.ballot);
+    # only already_voted is per-voter, so it is folded into the ETag as well.
+    ballot = get_ballot()
+    etag = f'"{ballot["etag"]}-{int(has_voted)}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        body = ballot['body'][:-1] + f',"already_voted":{"true" if has_voted else "false"}}}'
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
-@api_view(['POST'])
-def api_submit_vote(request):
-    voter_id = request.data.get('token')
-    votes_data = request.data.get('votes') # expecting {position_id: [candidate_id]}
+def clean_votes(votes_data, election_id):
+    """Validate a {position_id: [candidate_id]} ballot for the election; returns (pairs, error)."""
+    if not isinstance(votes_data, dict):
+        return None, 'Invalid ballot'
+    try:
+        selections = {int(pos_id): {int(cand_id) for cand_id in cands} for pos_id, cands in votes_data.items() if cands}
+    except (TypeError, ValueError):
+        return None, 'Invalid ballot'
+    if not selections:
+        return None, 'No candidates selected'
+
+    candidate_ids = set().union(*selections.values())
+    candidates = {
+        cand_id: (pos_id, max_vote)
+        for cand_id, pos_id, max_vote in Candidate.objects.filter(id__in=candidate_ids, election_id=election_id, is_approved=True)
+            .values_list('id', 'position_id', 'position__max_vote')
+    }
+    pairs = []
+    for pos_id, cand_ids in selections.items():
+        for cand_id in cand_ids:
+            if candidates.get(cand_id, (None,))[0] != pos_id:
+                return None, f'Candidate {cand_id} is not running for position {pos_id}'
+        if len(cand_ids) > candidates[next(iter(cand_ids))][1]:
+            return None, f'Too many candidates selected for position {pos_id}'
+        pairs.extend((pos_id, cand_id) for cand_id in cand_ids)
+    return pairs, None
+
+def prepare_ballot(claims, votes_data):
+    """The database-touching checks of api_submit_vote; returns (election_id, pairs, error)."""
+    if tokens.has_voted_hint(claims):
+        return None, None, 'Already voted'
+    election_id = current_election_id()
+    pairs, error = clean_votes(votes_data, election_id)
+    return election_id, pairs, error
+
+# Async for the same reason as api_login: under ASGI the request waits for the
+# vote writer (users/writer.py) without holding the shared sync thread.
+@csrf_exempt
+@require_POST
+async def api_submit_vote(request):
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+    except ValueError:
+        return JsonResponse({'error': 'Invalid request body'}, status=status.HTTP_400_BAD_REQUEST)
+    claims = tokens.verify(data.get('token'), tokens.VOTER)
+    votes_data = data.get('votes') # expecting {position_id: [candidate_id]}
     
-    if not voter_id:
-        return Response({'error': 'Unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+    if not claims:
+        return JsonResponse({'error': 'Unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
         
+    voter_id = claims['s']
+    election_id, pairs, error = await sync_to_async(prepare_ballot)(claims, votes_data)
+    if error:
+        return JsonResponse({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
-        voter = Voter.objects.get(id=voter_id)
-        if Vote.objects.filter(voter=voter).exists():
-             return Response({'error': 'Already voted'}, status=status.HTTP_400_BAD_REQUEST)
-             
-        votes_to_cast = []
-        for pos_id, candidates in votes_data.items():
-            for cand_id in candidates:
-                votes_to_cast.append(Vote(voter=voter, candidate_id=cand_id, position_id=pos_id))
-        
-        Vote.objects.bulk_create(votes_to_cast)
-        return Response({'success': True})
-    except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # The writer checks the receipt and inserts it with the votes in one
+        # transaction, so a second (even concurrent) submission is rejected
+        result = await writer.write((voter_id, election_id, pairs))
+    except asyncio.TimeoutError:
+        # Withdrawn before the writer took it, so a retry is safe
+        return JsonResponse({'error': 'Vote not recorded, please retry shortly'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    except Exception:
+        # The details (database errors) are for the log, not the voter
+        logger.exception("Vote of voter %s not recorded", voter_id)
+        return JsonResponse({'error': 'Vote not recorded, please retry shortly'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    if result == ACCEPTED:
+        return JsonResponse({'success': True, 'token': tokens.issue(voter_id, tokens.VOTER, voted_in=election_id)})
+    elif result == ALREADY_VOTED:
+        return JsonResponse({'error': 'Already voted'}, status=status.HTTP_400_BAD_REQUEST)
+    elif result == REJECTED:
+        # A candidate or position was removed after the ballot was checked
+        return JsonResponse({'error': 'The ballot has changed, please reload it and vote again'}, status=status.HTTP_409_CONFLICT)
+    elif result == IN_FLIGHT:
+        # Being written when the wait ran out: it may yet be recorded, and the
+        # reloaded ballot (already_voted) will tell
+        return JsonResponse(
+            {'error': 'Your vote is still being recorded. Reload the page to check it before voting again'},
+            status=status.HTTP_504_GATEWAY_TIMEOUT
+        )
+    # The voter row is gone (deleted after the token was issued)
+    return JsonResponse({'error': 'Unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
 
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from django.db.models import Count
+from django.db.models import Sum
+from django.db.models.functions import Coalesce, Upper
 
 @api_view(['POST'])
 def api_admin_login(request):
@@ -89,24 +199,38 @@ def api_admin_login(request):
     
     if user is not None:
         if user.is_staff or user.is_superuser:
-            return Response({'token': f"admin_{user.id}", 'user': {'username': user.username, 'is_admin': True}})
+            return Response({'token': tokens.issue(user.id, tokens.ADMIN), 'user': {'username': user.username, 'is_admin': True}})
         else:
              return Response({'error': 'Not authorized as admin'}, status=status.HTTP_403_FORBIDDEN)
     else:
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+@authentication_classes([])
+def api_logout(request):
+    # Voters send their token in the body, admins in the Authorization header
+    header = request.headers.get('Authorization', '').split()
+    token = header[1] if len(header) == 2 and header[0] == AdminTokenAuthentication.keyword else request.data.get('token')
+    claims = tokens.verify(token)
+    if claims:
+        tokens.revoke(claims)
+    return Response({'success': True})
+
 @api_view(['GET'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_dashboard_stats(request):
-    # Retrieve summary stats
-    position_count = Position.objects.count()
-    candidate_count = Candidate.objects.count()
+    # Retrieve summary stats for the current election
+    election = Election.objects.get(pk=current_election_id())
+    position_count = Position.objects.filter(election=election).count()
+    candidate_count = Candidate.objects.filter(election=election).count()
     voter_count = Voter.objects.count()
-    vote_count = Vote.objects.count()
+    vote_count = PositionTally.objects.filter(position__election=election).aggregate(total=Coalesce(Sum('votes'), 0))['total']
     
     # Get tally: Positions -> Candidates -> Vote Count
-    # Optimize: Use annotation to count votes in database
-    positions = Position.objects.prefetch_related(
-        models.Prefetch('candidates', queryset=Candidate.objects.annotate(vote_count=Count('votes')).order_by('-vote_count'))
+    # Read the materialized tallies (users.tally) instead of counting Vote rows
+    positions = Position.objects.filter(election=election).prefetch_related(
+        models.Prefetch('candidates', queryset=Candidate.objects.annotate(vote_count=Coalesce('tally__votes', 0)).order_by('-vote_count'))
     ).order_by('priority')
     
     tally = []
@@ -117,7 +241,7 @@ def api_dashboard_stats(request):
             candidates.append({
                 'id': cand.id,
                 'name': f"{cand.firstname} {cand.lastname}",
-                'symbol': cand.symbol.url if cand.symbol else None,
+                'symbol': variant_url(cand.symbol.name, cand.symbol_variants, 'thumb'),
                 'votes': cand.vote_count
             })
         
@@ -127,6 +251,7 @@ def api_dashboard_stats(request):
         })
         
     return Response({
+        'election': ElectionSerializer(election).data,
         'summary': {
             'positions': position_count,
             'candidates': candidate_count,
@@ -136,8 +261,48 @@ def api_dashboard_stats(request):
         'tally': tally
     })
 
+async def api_dashboard_stream(request):
+    # Server-Sent Events: a snapshot, then coalesced tally changes (users.live).
+    # Needs the ASGI server (evoting/asgi.py); WSGI cannot hold the stream open.
+    # EventSource cannot set headers, so the admin token comes in the query string.
+    if not tokens.verify(request.GET.get('token'), tokens.ADMIN):
+        return JsonResponse({'error': 'Unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI (manage.py runserver) the stream would be buffered and hold
+        # a worker thread for good; the dashboard polls api/admin/stats/ instead
+        return JsonResponse(
+            {'error': 'Live updates need the ASGI server; poll api/admin/stats/ instead'},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+    queue = await live.broadcaster.subscribe()
+
+    async def events():
+        try:
+            yield f"event: tally\ndata: {json.dumps(live.broadcaster.snapshot)}\n\n"
+            while True:
+                try:
+                    update = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: tally\ndata: {json.dumps(update)}\n\n"
+        finally:
+            live.broadcaster.unsubscribe(queue)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 # --- Voter Management APIs ---
-from .serializers import VoterSerializer
+from .serializers import VoterSerializer, VoterImportJobSerializer
+from .pagination import VoterPagination, VoterCursorPagination, CandidatePagination
+from .importer import VoterImport, UnreadableFile, iter_records
+from django.db import connection
+from django.utils import timezone
+import os
+import tempfile
+import threading
 import random
 import string
 
@@ -147,12 +312,44 @@ def generate_voter_id():
     digits = ''.join(random.choices(string.digits, k=6))
     return f"{letters}{digits}"
 
+def annotated_voters():
+    return Voter.objects.annotate(
+        has_voted=models.Exists(VoterBallotReceipt.objects.filter(voter=models.OuterRef('pk'), election_id=current_election_id()))
+    )
+
+def filter_voters(voters, params):
+    search = params.get('search')
+    if search:
+        voters = voters.filter(
+            models.Q(voters_id__istartswith=search) |
+            models.Q(lastname__istartswith=search) |
+            models.Q(firstname__istartswith=search)
+        )
+    if params.get('voters_id'):
+        voters = voters.filter(voters_id__istartswith=params['voters_id'])
+    if params.get('lastname'):
+        voters = voters.filter(lastname__istartswith=params['lastname'])
+    if params.get('gender'):
+        voters = voters.filter(gender=params['gender'])
+    if params.get('identity_type'):
+        voters = voters.filter(identity_type=params['identity_type'])
+    if params.get('has_voted') in ('true', 'false'):
+        voters = voters.filter(has_voted=params['has_voted'] == 'true')
+    return voters
+
 @api_view(['GET', 'POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_voters(request):
     if request.method == 'GET':
-        voters = Voter.objects.all().order_by('-id')
-        serializer = VoterSerializer(voters, many=True)
-        return Response(serializer.data)
+        voters = filter_voters(annotated_voters(), request.query_params).order_by('-id')
+        if 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor':
+            paginator = VoterCursorPagination()
+        else:
+            paginator = VoterPagination()
+        page = paginator.paginate_queryset(voters, request)
+        serializer = VoterSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     elif request.method == 'POST':
         # Conversion to native dict to avoid QueryDict immutability/quirks
@@ -169,8 +366,10 @@ def api_admin_voters(request):
         # Hash password - safely handle empty/missing cases
         raw_password = data.get('password')
         if raw_password and raw_password.strip():
-             hashed = bcrypt.hashpw(raw_password.encode('utf-8'), bcrypt.gensalt())
-             data['password'] = hashed.decode('utf-8')
+             try:
+                 data['password'] = hashing.hash_password(raw_password)
+             except hashing.HashingPoolBusy:
+                 return busy_response(Response)
         else:
              # Fail if no password provided for new voter
              return Response({'password': ['This field is required.']}, status=status.HTTP_400_BAD_REQUEST)
@@ -181,7 +380,77 @@ def api_admin_voters(request):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+IMPORT_ERRORS_LIMIT = 1000
+
+@api_view(['POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
+def api_admin_voters_import(request):
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response({'file': ['This field is required.']}, status=status.HTTP_400_BAD_REQUEST)
+    fmt = request.data.get('format') or ('ndjson' if upload.name.endswith(('.ndjson', '.jsonl')) else 'csv')
+    if fmt not in ('csv', 'ndjson'):
+        return Response({'format': ['Must be "csv" or "ndjson".']}, status=status.HTTP_400_BAD_REQUEST)
+
+    # The upload is gone once the request ends, so the import reads a copy
+    with tempfile.NamedTemporaryFile(prefix='voter-import-', suffix=f'.{fmt}', delete=False) as f:
+        for chunk in upload.chunks():
+            f.write(chunk)
+    job = VoterImportJob.objects.create()
+    if settings.VOTER_IMPORT_THREADED:
+        import_in_background(job, f.name, fmt)
+    else:
+        run_import(job, f.name, fmt)
+        job.refresh_from_db()
+    return Response(VoterImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
+def api_admin_voters_import_detail(request, pk):
+    try:
+        job = VoterImportJob.objects.get(pk=pk)
+    except VoterImportJob.DoesNotExist:
+        return Response({'error': 'Import not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(VoterImportJobSerializer(job).data)
+
+def run_import(job, path, fmt):
+    """Import the voters in ``path``, recording progress and the outcome on ``job``."""
+    importer = VoterImport(hash_passwords=hashing.hash_passwords)
+
+    def progress(importer):
+        VoterImportJob.objects.filter(pk=job.pk).update(created=importer.created, rejected=len(importer.errors))
+
+    outcome = {'status': 'done'}
+    try:
+        with open(path, 'rb') as f:
+            importer.run(iter_records(f, fmt), on_batch=progress)
+    except UnreadableFile as e:
+        # Chunks before the bad row stay saved; re-sending the fixed file reports them as duplicates
+        outcome = {'status': 'failed', 'error': str(e)}
+    except Exception:
+        logger.exception("Voter import %s failed", job.pk)
+        outcome = {'status': 'failed', 'error': 'The import stopped on a server error'}
+    finally:
+        os.remove(path)
+    errors = sorted(importer.errors, key=lambda error: error['row'])
+    VoterImportJob.objects.filter(pk=job.pk).update(
+        created=importer.created, rejected=len(errors), errors=errors[:IMPORT_ERRORS_LIMIT],
+        finished_at=timezone.now(), **outcome
+    )
+
+def import_in_background(job, path, fmt):
+    def run():
+        try:
+            run_import(job, path, fmt)
+        finally:
+            connection.close()
+    threading.Thread(target=run, name=f"voter-import-{job.pk}", daemon=True).start()
+
 @api_view(['PUT', 'DELETE'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_voter_detail(request, pk):
     try:
         voter = Voter.objects.get(pk=pk)
@@ -194,8 +463,10 @@ def api_admin_voter_detail(request, pk):
         
         raw_password = data.get('password')
         if raw_password and raw_password.strip():
-             hashed = bcrypt.hashpw(raw_password.encode('utf-8'), bcrypt.gensalt())
-             data['password'] = hashed.decode('utf-8')
+             try:
+                 data['password'] = hashing.hash_password(raw_password)
+             except hashing.HashingPoolBusy:
+                 return busy_response(Response)
         elif 'password' in data:
             # If password key exists but is empty, remove it so we don't overwrite with empty string
             del data['password']
@@ -203,11 +474,16 @@ def api_admin_voter_detail(request, pk):
         serializer = VoterSerializer(voter, data=data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            if 'password' in data:
+                # Sessions opened with the old password end now, not when they expire
+                tokens.revoke_subject(tokens.VOTER, voter.id)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     elif request.method == 'DELETE':
-        voter.delete()
+        with transaction.atomic():
+            tally.discard_votes(voter.votes.all())
+            voter.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -218,12 +494,38 @@ def generate_candidate_id():
     digits = ''.join(random.choices(string.digits, k=6))
     return f"C{letters}{digits}"
 
+def filter_candidates(candidates, params):
+    # Within an election, the election and position foreign key indexes serve
+    # these filters and the -id ordering (SQLite indexes end in the rowid)
+    search = params.get('search')
+    if search:
+        candidates = candidates.filter(
+            models.Q(candidate_id__istartswith=search) |
+            models.Q(lastname__istartswith=search) |
+            models.Q(firstname__istartswith=search) |
+            models.Q(party_name__istartswith=search)
+        )
+    if str(params.get('position', '')).isdigit():
+        candidates = candidates.filter(position_id=params['position'])
+    if params.get('party_type'):
+        candidates = candidates.filter(party_type=params['party_type'])
+    if params.get('party_name'):
+        candidates = candidates.filter(party_name__istartswith=params['party_name'])
+    if params.get('is_approved') in ('true', 'false'):
+        candidates = candidates.filter(is_approved=params['is_approved'] == 'true')
+    return candidates
+
 @api_view(['GET', 'POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_candidates(request):
     if request.method == 'GET':
-        candidates = Candidate.objects.select_related('position').all().order_by('-id')
-        serializer = CandidateSerializer(candidates, many=True)
-        return Response(serializer.data)
+        candidates = Candidate.objects.select_related('position').filter(election_id=current_election_id())
+        candidates = filter_candidates(candidates, request.query_params).order_by('-id')
+        paginator = CandidatePagination()
+        page = paginator.paginate_queryset(candidates, request)
+        serializer = CandidateSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
         
     elif request.method == 'POST':
         data = request.data.copy()
@@ -232,20 +534,23 @@ def api_admin_candidates(request):
         if 'candidate_id' not in data or not data['candidate_id']:
              while True:
                 cid = generate_candidate_id()
-                if not Candidate.objects.filter(candidate_id=cid).exists():
+                if not Candidate.objects.filter(candidate_id=cid, election_id=current_election_id()).exists():
                     data['candidate_id'] = cid
                     break
         
         serializer = CandidateSerializer(data=data)
         if serializer.is_valid():
-            serializer.save()
+            serializer.save(election_id=current_election_id())
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['PUT', 'DELETE'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_candidate_detail(request, pk):
     try:
-        candidate = Candidate.objects.get(pk=pk)
+        # Archived elections are read-only
+        candidate = Candidate.objects.get(pk=pk, election_id=current_election_id())
     except Candidate.DoesNotExist:
         return Response({'error': 'Candidate not found'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -257,27 +562,40 @@ def api_admin_candidate_detail(request, pk):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     elif request.method == 'DELETE':
-        candidate.delete()
+        with transaction.atomic():
+            tally.discard_votes(candidate.votes.all())
+            candidate.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 @api_view(['GET', 'POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_positions(request):
     if request.method == 'GET':
-        positions = Position.objects.all().order_by('priority')
-        serializer = PositionSerializer(positions, many=True)
+        positions = Position.objects.filter(election_id=current_election_id()).order_by('priority')
+        # ?candidates=count or ?candidates=none for screens that only need the position rows
+        include = request.query_params.get('candidates')
+        if include == 'count':
+            serializer = PositionSummarySerializer(positions.annotate(candidate_count=models.Count('candidates')), many=True)
+        elif include == 'none':
+            serializer = PositionSummarySerializer(positions, many=True)
+        else:
+            serializer = PositionSerializer(positions.prefetch_related('candidates'), many=True)
         return Response(serializer.data)
         
     elif request.method == 'POST':
         serializer = PositionSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            serializer.save(election_id=current_election_id())
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['PUT', 'DELETE'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_position_detail(request, pk):
     try:
-        position = Position.objects.get(pk=pk)
+        position = Position.objects.get(pk=pk, election_id=current_election_id())
     except Position.DoesNotExist:
          return Response({'error': 'Position not found'}, status=status.HTTP_404_NOT_FOUND)
          
@@ -293,6 +611,8 @@ def api_admin_position_detail(request, pk):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 @api_view(['GET', 'POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_election_title(request):
     if request.method == 'GET':
         title = Title.objects.first()
@@ -314,22 +634,221 @@ def api_election_title(request):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+# --- Vote Listing / Export ---
+import base64
+import csv
+from datetime import datetime
+from core.renderers import dumps
+
+VOTES_PAGE_SIZE = 100
+VOTES_MAX_PAGE_SIZE = 1000
+VOTES_EXPORT_CHUNK_SIZE = 2000
+
+VOTE_ROW_FIELDS = (
+    'id', 'timestamp', 'voter__voters_id', 'candidate__firstname',
+    'candidate__lastname', 'candidate__symbol', 'candidate__symbol_variants',
+    'position__description',
+)
+
+def vote_row(row):
+    return {
+        'id': row['id'],
+        'voter_id_number': row['voter__voters_id'],
+        'candidate_name': f"{row['candidate__firstname']} {row['candidate__lastname']}",
+        'candidate_symbol': variant_url(row['candidate__symbol'], row['candidate__symbol_variants'], 'thumb'),
+        'position_name': row['position__description'],
+        'timestamp': row['timestamp']
+    }
+
+def encode_vote_cursor(row):
+    raw = f"{row['timestamp'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_vote_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    timestamp, pk = raw.rsplit('|', 1)
+    return datetime.fromisoformat(timestamp), int(pk)
+
+class Echo:
+    """Pseudo-buffer for csv.writer: hands each written line straight back."""
+    def write(self, value):
+        return value
+
+def stream_votes_ndjson(rows):
+    for row in rows:
+        yield dumps(vote_row(row)) + b'\n'
+
+def stream_votes_csv(rows):
+    columns = ['id', 'voter_id_number', 'candidate_name', 'candidate_symbol', 'position_name', 'timestamp']
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        data = vote_row(row)
+        data['timestamp'] = data['timestamp'].isoformat()
+        yield writer.writerow([data[col] for col in columns])
+
 @api_view(['GET'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_votes(request):
-    votes = Vote.objects.all().select_related('voter', 'candidate', 'position').order_by('-timestamp')
-    data = []
-    for vote in votes:
-        data.append({
-            'id': vote.id,
-            'voter_id_number': vote.voter.voters_id,
-            'candidate_name': f"{vote.candidate.firstname} {vote.candidate.lastname}",
-            'candidate_symbol': vote.candidate.symbol.url if vote.candidate.symbol else None,
-            'position_name': vote.position.description,
-            'timestamp': vote.timestamp
-        })
-    return Response(data)
+    # Current election unless ?election=<id> asks for an archived one
+    election_id = request.query_params.get('election') or current_election_id()
+    if not str(election_id).isdigit():
+        return Response({'error': 'Invalid election'}, status=status.HTTP_400_BAD_REQUEST)
+    # Newest first; (timestamp, id) is the keyset so pages stay stable while votes arrive
+    votes = Vote.objects.filter(election_id=election_id).order_by('-timestamp', '-id').values(*VOTE_ROW_FIELDS)
+
+    export = request.query_params.get('export')
+    if export in ('ndjson', 'csv'):
+        rows = votes.iterator(chunk_size=VOTES_EXPORT_CHUNK_SIZE)
+        if export == 'ndjson':
+            response = StreamingHttpResponse(stream_votes_ndjson(rows), content_type='application/x-ndjson')
+        else:
+            response = StreamingHttpResponse(stream_votes_csv(rows), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="votes.{export}"'
+        return response
+    elif export:
+        return Response({'error': 'export must be "ndjson" or "csv"'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limit = min(int(request.query_params.get('limit', VOTES_PAGE_SIZE)), VOTES_MAX_PAGE_SIZE)
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        try:
+            timestamp, pk = decode_vote_cursor(cursor)
+        except (ValueError, UnicodeDecodeError):
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        votes = votes.filter(models.Q(timestamp__lt=timestamp) | models.Q(timestamp=timestamp, id__lt=pk))
+
+    # Fetch one extra row to know whether another page exists
+    rows = list(votes[:limit + 1])
+    next_cursor = encode_vote_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return Response({
+        'results': [vote_row(row) for row in rows[:limit]],
+        'next': next_cursor
+    })
+
+def drain_timeout_response():
+    # Ballots already acknowledged to voters are still being written to the current election
+    return Response(
+        {'error': 'Votes are still being recorded, please retry shortly'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': str(settings.VOTE_DRAIN_TIMEOUT)}
+    )
 
 @api_view(['POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
 def api_admin_reset_votes(request):
-    Vote.objects.all().delete()
-    return Response({'success': True, 'message': 'All votes have been reset.'})
+    # Votes are not deleted: the current election is archived as it stands and
+    # a new one starts with the same positions and candidates (core.elections)
+    if not writer.drain(settings.VOTE_DRAIN_TIMEOUT):
+        return drain_timeout_response()
+    election = start_election(request.data.get('title'))
+    live.notify_tally_changed()
+    return Response({'success': True, 'message': 'A new election has been started.', 'election': ElectionSerializer(election).data})
+
+# --- Elections ---
+
+@api_view(['GET', 'POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
+def api_admin_elections(request):
+    if request.method == 'GET':
+        elections = Election.objects.annotate(
+            votes_cast=Coalesce(Sum('positions__tally__votes'), 0)
+        ).order_by('-id')
+        return Response([{**ElectionSerializer(e).data, 'votes_cast': e.votes_cast} for e in elections])
+
+    elif request.method == 'POST':
+        if not writer.drain(settings.VOTE_DRAIN_TIMEOUT):
+            return drain_timeout_response()
+        copy_ballot = str(request.data.get('copy_ballot', True)).lower() != 'false'
+        election = start_election(request.data.get('title'), copy_ballot=copy_ballot)
+        live.notify_tally_changed()
+        return Response(ElectionSerializer(election).data, status=status.HTTP_201_CREATED)
+
+def purge_in_background(election):
+    def run():
+        try:
+            purge_election(election)
+        except Exception:
+            # Marked 'purge_failed' with the error; purging it again resumes
+            logger.exception("Purge of election %s failed", election.pk)
+        finally:
+            connection.close()
+    threading.Thread(target=run, name=f"purge-election-{election.pk}", daemon=True).start()
+
+@api_view(['POST'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
+def api_admin_election_purge(request, pk):
+    try:
+        election = Election.objects.get(pk=pk)
+    except Election.DoesNotExist:
+        return Response({'error': 'Election not found'}, status=status.HTTP_404_NOT_FOUND)
+    if election.status not in PURGEABLE_STATUSES:
+        return Response({'error': 'Only archived elections can be purged'}, status=status.HTTP_400_BAD_REQUEST)
+    purge_in_background(election)
+    return Response({'success': True, 'message': 'Purge started.'}, status=status.HTTP_202_ACCEPTED)
+
+# --- Profiles ---
+from django.http import FileResponse
+from core import profiling
+
+@api_view(['GET'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
+def api_admin_profiles(request):
+    # Requests sent with X-Profile-Token: <admin token> (core.profiling)
+    return Response(profiling.list_profiles())
+
+@api_view(['GET'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
+def api_admin_profile_detail(request, profile_id):
+    # JSON summary with the SQL statements by default; ?download=prof for the pstats file
+    if request.query_params.get('download') == 'prof':
+        path = profiling.profile_path(profile_id, '.prof')
+        if path is None:
+            return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{profile_id}.prof')
+    path = profiling.profile_path(profile_id, '.json')
+    if path is None:
+        return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    with open(path) as f:
+        return Response(json.load(f))
+
+# --- Slow queries ---
+from core import querylog
+
+@api_view(['GET', 'DELETE'])
+@authentication_classes([AdminTokenAuthentication])
+@permission_classes([IsElectionAdmin])
+def api_admin_slow_queries(request):
+    if request.method == 'DELETE':
+        querylog.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    entries = querylog.slow_queries()
+    if request.query_params.get('group') != 'sql':
+        return Response({'threshold_ms': settings.SLOW_QUERY_MS, 'results': entries})
+
+    # One row per normalized statement, slowest total first
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry['sql'], {'sql': entry['sql'], 'count': 0, 'total_ms': 0, 'max_ms': 0, 'origins': []})
+        group['count'] += 1
+        group['total_ms'] = round(group['total_ms'] + entry['ms'], 3)
+        group['max_ms'] = max(group['max_ms'], entry['ms'])
+        if entry['origin'] not in group['origins']:
+            group['origins'].append(entry['origin'])
+    return Response({
+        'threshold_ms': settings.SLOW_QUERY_MS,
+        'results': sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True),
+    })
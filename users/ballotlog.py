@@ -0,0 +1,190 @@
+import fcntl
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from .writer import ballot_status, write_ballots, ACCEPTED, ALREADY_VOTED, UNKNOWN_VOTER, REJECTED, STOP
+
+logger = logging.getLogger(__name__)
+
+# Append-only ballot log (enabled with VOTE_LOG_DIR). Accepted ballots are
+# appended as JSON lines and fsynced once per batch before the voter gets an
+# answer; a committer thread then applies them to Vote in large transactions
+# and records how far it got in ballots.applied. After a crash everything past
+# that offset is replayed. Applying is idempotent (a voter with a receipt is
+# skipped), so replaying a batch that did commit is harmless.
+#
+# A ballot that cannot be applied (its candidate was deleted meanwhile, or it
+# keeps failing) is moved to ballots.rejected with the reason, so it neither
+# holds up the ballots behind it nor comes back on the next replay.
+#
+# Voters with a ballot still in the log are tracked in memory (per election),
+# which is why a log directory belongs to exactly one process.
+
+class BallotLog:
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'ballots.log')
+        self.checkpoint_path = os.path.join(directory, 'ballots.applied')
+        self.rejected_path = os.path.join(directory, 'ballots.rejected')
+        self.file = open(self.path, 'a+b')
+        try:
+            fcntl.flock(self.file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.file.close()
+            raise ImproperlyConfigured(f"{self.path} is in use by another process; run a single worker with VOTE_LOG_DIR")
+        self.lock = threading.Lock()
+        self.applied = threading.Condition(self.lock)
+        self.pending = set()
+        self.queue = queue.Queue()
+        self.size = 0
+        self.replay()
+        self.thread = threading.Thread(target=self.run, name='ballot-committer', daemon=True)
+        self.thread.start()
+
+    def read_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def write_checkpoint(self, offset):
+        # No fsync: a stale checkpoint only means re-applying ballots that are already in
+        tmp = self.checkpoint_path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(str(offset))
+        os.replace(tmp, self.checkpoint_path)
+
+    def replay(self):
+        self.file.seek(0, os.SEEK_END)
+        size = self.file.tell()
+        applied = self.read_checkpoint()
+        if applied > size:
+            applied = 0
+        self.file.seek(applied)
+        data = self.file.read()
+        complete = data.rfind(b'\n') + 1
+        if applied + complete < size:
+            # Torn last record from a crash mid-append; it was never acknowledged
+            self.file.truncate(applied + complete)
+        self.size = applied
+        for line in data[:complete].splitlines(keepends=True):
+            self.size += len(line)
+            record = json.loads(line)
+            self.pending.add((record['v'], record['e']))
+            self.queue.put((self.size, (record['v'], record['e'], [tuple(pair) for pair in record['p']])))
+
+    def accept(self, ballots):
+        """Durably log [(voter_id, election_id, pairs)]; returns ACCEPTED, ALREADY_VOTED or UNKNOWN_VOTER per ballot."""
+        with self.lock:
+            # Checked under the lock so a ballot the committer is just applying
+            # is either still pending or already has its receipt
+            known, voted = ballot_status({(voter_id, election_id) for voter_id, election_id, _ in ballots})
+            results, accepted = [], []
+            for ballot in ballots:
+                voter_id, election_id, pairs = ballot
+                if voter_id not in known:
+                    results.append(UNKNOWN_VOTER)
+                elif (voter_id, election_id) in voted or (voter_id, election_id) in self.pending:
+                    results.append(ALREADY_VOTED)
+                else:
+                    self.pending.add((voter_id, election_id))
+                    results.append(ACCEPTED)
+                    line = json.dumps({'v': voter_id, 'e': election_id, 'p': pairs}, separators=(',', ':')).encode('utf-8') + b'\n'
+                    accepted.append((ballot, line))
+            if not accepted:
+                return results
+            try:
+                self.file.write(b''.join(line for _, line in accepted))
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            except BaseException:
+                self.file.truncate(self.size)
+                self.pending.difference_update((voter_id, election_id) for (voter_id, election_id, _), _ in accepted)
+                raise
+            for ballot, line in accepted:
+                self.size += len(line)
+                self.queue.put((self.size, ballot))
+        return results
+
+    def drain(self, timeout=None):
+        """Wait until every logged ballot has been applied to Vote; False if ``timeout`` ran out first."""
+        with self.applied:
+            return self.applied.wait_for(lambda: not self.pending, timeout)
+
+    def stop(self):
+        """Apply what is logged, then end the committer and release the log."""
+        if self.thread.is_alive():
+            self.queue.put(STOP)
+            self.thread.join()
+        self.file.close()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self.queue.get()
+            while item is not STOP:
+                batch.append(item)
+                if len(batch) >= settings.VOTE_LOG_APPLY_BATCH:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = item is STOP
+            if not batch:
+                continue
+            ballots = [ballot for _, ballot in batch]
+            for ballot, result in zip(ballots, self.apply(ballots)):
+                if result == REJECTED:
+                    self.reject(ballot, 'names a candidate or position that no longer exists')
+                elif result is None:
+                    self.reject(ballot, f'not applied after {settings.VOTE_LOG_APPLY_ATTEMPTS} attempts')
+            with self.applied:
+                self.pending.difference_update((voter_id, election_id) for _, (voter_id, election_id, _) in batch)
+                offset = batch[-1][0]
+                if offset == self.size and self.size >= settings.VOTE_LOG_COMPACT_BYTES:
+                    # Everything logged is applied: start the log over
+                    self.file.truncate(0)
+                    self.size = offset = 0
+                self.write_checkpoint(offset)
+                self.applied.notify_all()
+        connection.close()
+
+    def apply(self, ballots):
+        """write_ballots, falling back to one ballot at a time; None for a ballot that kept failing."""
+        try:
+            return write_ballots(ballots)
+        except Exception:
+            logger.exception("Ballot log: applying %d ballots failed; applying them one by one", len(ballots))
+            connection.close()
+        return [self.apply_one(ballot) for ballot in ballots]
+
+    def apply_one(self, ballot):
+        for attempt in range(1, settings.VOTE_LOG_APPLY_ATTEMPTS + 1):
+            try:
+                return write_ballots([ballot])[0]
+            except Exception:
+                # Transient failures (a locked or unreachable database) get a few more tries
+                logger.exception("Ballot log: ballot of voter %s failed (attempt %d)", ballot[0], attempt)
+                connection.close()
+                if attempt < settings.VOTE_LOG_APPLY_ATTEMPTS:
+                    time.sleep(attempt)
+        return None
+
+    def reject(self, ballot, reason):
+        """Move an acknowledged ballot that cannot be applied to ballots.rejected."""
+        voter_id, election_id, pairs = ballot
+        logger.error("Ballot log: ballot of voter %s in election %s moved to %s: %s", voter_id, election_id, self.rejected_path, reason)
+        line = json.dumps({'v': voter_id, 'e': election_id, 'p': pairs, 'reason': reason}, separators=(',', ':'))
+        with open(self.rejected_path, 'a') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,95 @@
+import asyncio
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from django.conf import settings
+from core.metrics import bcrypt_latency
+import bcrypt
+
+# bcrypt costs tens to hundreds of milliseconds per call. All hashing and
+# verification goes through one bounded pool so a login surge queues here
+# (and is shed with 503s once the queue is full) instead of pinning every
+# request worker on CPU.
+
+class HashingPoolBusy(Exception):
+    """Raised when more than BCRYPT_POOL_MAX_PENDING jobs are already queued."""
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+def _pool():
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = settings.BCRYPT_POOL_WORKERS
+                if settings.BCRYPT_POOL_KIND == 'process':
+                    _executor = ProcessPoolExecutor(max_workers=workers)
+                else:
+                    # bcrypt releases the GIL, so threads run in parallel
+                    _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+                _slots = threading.BoundedSemaphore(settings.BCRYPT_POOL_MAX_PENDING)
+    return _executor
+
+def _submit(fn, *args):
+    executor = _pool()
+    if not _slots.acquire(blocking=False):
+        raise HashingPoolBusy()
+    started = time.perf_counter()
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+
+    def done(future):
+        _slots.release()
+        bcrypt_latency.observe((fn.__name__[len('bcrypt_'):],), time.perf_counter() - started)
+    future.add_done_callback(done)
+    return future
+
+def bcrypt_hash(raw_password):
+    return bcrypt.hashpw(raw_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+def bcrypt_check(raw_password, hashed):
+    return bcrypt.checkpw(raw_password.encode('utf-8'), hashed.encode('utf-8'))
+
+def hash_password(raw_password):
+    return _submit(bcrypt_hash, raw_password).result()
+
+def check_password(raw_password, hashed):
+    return _submit(bcrypt_check, raw_password, hashed).result()
+
+def hash_passwords(raw_passwords):
+    """Hash a list of passwords on the shared pool, for background voter imports.
+
+    At most half as many as there are pool workers are queued at a time, so a
+    login never waits behind more than a round of import hashes. When the pool
+    is full the call waits for its own oldest job, or for BCRYPT_RETRY_AFTER
+    if it has none queued; it never raises HashingPoolBusy.
+    """
+    window = max(1, settings.BCRYPT_POOL_WORKERS // 2)
+    pending = collections.deque()
+    hashed = []
+    for raw_password in raw_passwords:
+        if len(pending) >= window:
+            hashed.append(pending.popleft().result())
+        while True:
+            try:
+                pending.append(_submit(bcrypt_hash, raw_password))
+                break
+            except HashingPoolBusy:
+                if pending:
+                    hashed.append(pending.popleft().result())
+                else:
+                    time.sleep(settings.BCRYPT_RETRY_AFTER)
+    hashed.extend(future.result() for future in pending)
+    return hashed
+
+async def ahash_password(raw_password):
+    return await asyncio.wrap_future(_submit(bcrypt_hash, raw_password))
+
+async def acheck_password(raw_password, hashed):
+    return await asyncio.wrap_future(_submit(bcrypt_check, raw_password, hashed))
@@ -0,0 +1,200 @@
+import csv
+import json
+import random
+import string
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from django.db import transaction, IntegrityError
+from .hashing import bcrypt_hash
+from .models import Voter
+
+# Bulk voter registration: records are streamed from CSV/NDJSON, validated and
+# written in chunks. Each chunk costs a fixed number of queries (duplicate
+# identity numbers, voter-id collisions, one bulk_create) and its passwords are
+# hashed across a process pool, or on the shared hashing pool for API uploads.
+
+VOTER_FIELDS = ['voters_id', 'firstname', 'middlename', 'lastname', 'gender', 'identity_type',
+                'aadhaar_hash', 'dob', 'age', 'address', 'password']
+REQUIRED_FIELDS = ['firstname', 'lastname', 'aadhaar_hash', 'address', 'password']
+GENDERS = {value for value, _ in Voter.GENDER_CHOICES}
+IDENTITY_TYPES = {value for value, _ in Voter.IDENTITY_TYPE_CHOICES}
+
+class UnreadableFile(ValueError):
+    """The file is not UTF-8 text or not well-formed CSV; ``row`` is the record it broke at."""
+
+    def __init__(self, row, reason):
+        super().__init__(f"Row {row}: {reason}")
+        self.row = row
+
+def iter_records(fileobj, fmt):
+    """Yield dict records from a binary or text file in 'csv' or 'ndjson' format.
+
+    Raises UnreadableFile once a line cannot be decoded or parsed; the records
+    before it have already been yielded.
+    """
+    if fmt not in ('csv', 'ndjson'):
+        raise ValueError(f"Unsupported format: {fmt}")
+    row = 0
+
+    def lines():
+        # Decoded line by line, so the error points at the record being read
+        for line in fileobj:
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode('utf-8-sig')
+                except UnicodeDecodeError:
+                    raise UnreadableFile(row + 1, 'not valid UTF-8 text') from None
+            yield line
+
+    if fmt == 'csv':
+        try:
+            for row, record in enumerate(csv.DictReader(lines()), start=1):
+                yield record
+        except csv.Error as e:
+            raise UnreadableFile(row + 1, f'malformed CSV ({e})') from None
+    else:
+        for line in lines():
+            if line.strip():
+                row += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield record if isinstance(record, dict) else {'__invalid__': line.strip()[:80]}
+
+def clean_record(record):
+    """Return (fields, errors) for one input record."""
+    if '__invalid__' in record:
+        return None, {'record': ['Not a JSON object']}
+    fields = {}
+    errors = {}
+    for name in VOTER_FIELDS:
+        value = record.get(name)
+        value = str(value).strip() if value is not None else ''
+        if value:
+            fields[name] = value
+    for name in REQUIRED_FIELDS:
+        if name not in fields:
+            errors[name] = ['This field is required.']
+    for name, limit in (('firstname', 30), ('middlename', 30), ('lastname', 30), ('voters_id', 15), ('aadhaar_hash', 255)):
+        if name in fields and len(str(fields[name])) > limit:
+            errors[name] = [f'Ensure this field has no more than {limit} characters.']
+    if fields.setdefault('gender', 'Male') not in GENDERS:
+        errors['gender'] = [f"\"{fields['gender']}\" is not a valid choice."]
+    if fields.setdefault('identity_type', 'aadhaar') not in IDENTITY_TYPES:
+        errors['identity_type'] = [f"\"{fields['identity_type']}\" is not a valid choice."]
+    try:
+        fields['age'] = int(fields.get('age', 18))
+        if fields['age'] < 18:
+            errors['age'] = ['Voter must be 18 years or older.']
+    except (TypeError, ValueError):
+        errors['age'] = ['A valid integer is required.']
+    if 'dob' in fields:
+        try:
+            fields['dob'] = date.fromisoformat(str(fields['dob']))
+        except ValueError:
+            errors['dob'] = ['Date has wrong format. Use YYYY-MM-DD.']
+    return fields, errors
+
+def generate_voter_ids(count, taken):
+    """Return ``count`` new voter ids not in the database nor in ``taken``.
+
+    Candidates are drawn in bulk and checked with a single IN query per round.
+    """
+    ids = []
+    while len(ids) < count:
+        needed = count - len(ids)
+        candidates = {
+            ''.join(random.choices(string.ascii_uppercase, k=3)) + ''.join(random.choices(string.digits, k=6))
+            for _ in range(needed + needed // 10 + 1)
+        } - taken
+        candidates -= set(Voter.objects.filter(voters_id__in=candidates).values_list('voters_id', flat=True))
+        fresh = list(candidates)[:needed]
+        taken.update(fresh)
+        ids.extend(fresh)
+    return ids
+
+class VoterImport:
+    def __init__(self, batch_size=1000, workers=None, executor=None, hash_passwords=None):
+        """Passwords are hashed by ``hash_passwords(list)`` when given, otherwise
+        across ``executor`` (by default a private pool of ``workers`` processes)."""
+        self.batch_size = batch_size
+        self.owns_executor = executor is None and hash_passwords is None
+        self.executor = ProcessPoolExecutor(max_workers=workers) if self.owns_executor else executor
+        self.hash_passwords = hash_passwords or self.hash_on_executor
+        self.created = 0
+        self.errors = []
+        self.seen_identity = set()
+        self.seen_voter_ids = set()
+
+    def run(self, records, on_batch=None):
+        batch = []
+        try:
+            for number, record in enumerate(records, start=1):
+                batch.append((number, record))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch)
+                    batch = []
+                    if on_batch:
+                        on_batch(self)
+            if batch:
+                self.import_batch(batch)
+                if on_batch:
+                    on_batch(self)
+        finally:
+            if self.owns_executor:
+                self.executor.shutdown()
+        self.errors.sort(key=lambda error: error['row'])
+        return self
+
+    def hash_on_executor(self, raw_passwords):
+        return self.executor.map(bcrypt_hash, raw_passwords, chunksize=16)
+
+    def reject(self, number, errors):
+        self.errors.append({'row': number, 'errors': errors})
+
+    def import_batch(self, batch):
+        rows = []
+        for number, record in batch:
+            fields, errors = clean_record(record)
+            if errors:
+                self.reject(number, errors)
+            else:
+                rows.append((number, fields))
+
+        # Duplicates against the database and within this import
+        identities = {fields['aadhaar_hash'] for _, fields in rows}
+        existing_identities = set(Voter.objects.filter(aadhaar_hash__in=identities).values_list('aadhaar_hash', flat=True))
+        given_ids = {fields['voters_id'] for _, fields in rows if 'voters_id' in fields}
+        existing_ids = set(Voter.objects.filter(voters_id__in=given_ids).values_list('voters_id', flat=True))
+        accepted = []
+        for number, fields in rows:
+            if fields['aadhaar_hash'] in existing_identities or fields['aadhaar_hash'] in self.seen_identity:
+                self.reject(number, {'aadhaar_hash': ['voter with this aadhaar hash already exists.']})
+            elif fields.get('voters_id') in existing_ids or fields.get('voters_id') in self.seen_voter_ids:
+                self.reject(number, {'voters_id': ['voter with this voters id already exists.']})
+            else:
+                self.seen_identity.add(fields['aadhaar_hash'])
+                if 'voters_id' in fields:
+                    self.seen_voter_ids.add(fields['voters_id'])
+                accepted.append((number, fields))
+        if not accepted:
+            return
+
+        missing = [fields for _, fields in accepted if 'voters_id' not in fields]
+        for fields, voter_id in zip(missing, generate_voter_ids(len(missing), self.seen_voter_ids)):
+            fields['voters_id'] = voter_id
+
+        hashes = self.hash_passwords([fields['password'] for _, fields in accepted])
+        for (_, fields), hashed in zip(accepted, hashes):
+            fields['password'] = hashed
+
+        try:
+            with transaction.atomic():
+                Voter.objects.bulk_create([Voter(**fields) for _, fields in accepted])
+        except IntegrityError as e:
+            # Lost a race with another registration; the whole chunk was rolled back
+            for number, _ in accepted:
+                self.reject(number, {'non_field_errors': [str(e)]})
+            return
+        self.created += len(accepted)
@@ -0,0 +1,89 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from core.elections import current_election_id
+from .models import CandidateTally
+
+# Live tally push for the admin dashboard. One broadcaster per process (per
+# ASGI event loop) reads the materialized tallies while anyone is subscribed
+# and fans the changed counts out to every connected stream, so viewers add no
+# database load. Votes committed in this process wake it (notify_tally_changed);
+# votes committed by other processes are picked up every TALLY_PUSH_IDLE_POLL
+# seconds. Either way at most one update goes out per TALLY_PUSH_INTERVAL.
+
+class TallyBroadcaster:
+    def __init__(self):
+        self.subscribers = set()
+        self.snapshot = None
+        self.task = None
+        self.loop = None
+        self.wake = None
+
+    async def refresh(self):
+        election = await sync_to_async(current_election_id)()
+        candidates = {
+            pk: votes async for pk, votes in
+            CandidateTally.objects.filter(candidate__election_id=election).values_list('candidate_id', 'votes')
+        }
+        # Every vote row counts towards exactly one candidate, so this matches the
+        # PositionTally total without a second (possibly inconsistent) read
+        votes_cast = sum(candidates.values())
+        previous = self.snapshot
+        self.snapshot = {'election': election, 'candidates': candidates, 'votes_cast': votes_cast}
+        if previous is None:
+            return None
+        if election != previous['election']:
+            # New election: clients reload the dashboard rather than patch it
+            return dict(self.snapshot)
+        changed = {pk: votes for pk, votes in candidates.items() if previous['candidates'].get(pk) != votes}
+        # Candidates whose tally row vanished (votes reset) drop back to zero
+        changed.update({pk: 0 for pk in previous['candidates'] if pk not in candidates})
+        if not changed and votes_cast == previous['votes_cast']:
+            return None
+        return {'election': election, 'candidates': changed, 'votes_cast': votes_cast}
+
+    async def subscribe(self):
+        queue = asyncio.Queue(maxsize=settings.TALLY_PUSH_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop, self.wake, self.task, self.snapshot = loop, asyncio.Event(), None, None
+        self.subscribers.add(queue)
+        if self.snapshot is None:
+            await self.refresh()
+        if self.task is None or self.task.done():
+            self.task = loop.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    async def run(self):
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=settings.TALLY_PUSH_IDLE_POLL)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            delta = await self.refresh()
+            if delta:
+                for queue in list(self.subscribers):
+                    if queue.full():
+                        # Slow consumer: replace its backlog with one full resync
+                        while not queue.empty():
+                            queue.get_nowait()
+                        queue.put_nowait(dict(self.snapshot))
+                    else:
+                        queue.put_nowait(delta)
+            # Coalesce: commits arriving during this pause share the next update
+            await asyncio.sleep(settings.TALLY_PUSH_INTERVAL)
+        self.snapshot = None
+
+    def notify(self):
+        if self.loop is not None and self.wake is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.wake.set)
+
+broadcaster = TallyBroadcaster()
+
+def notify_tally_changed():
+    """Hook for transaction.on_commit after votes are written or reset."""
+    broadcaster.notify()
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from django.db.models.functions import Upper
+from core.elections import current_election_id
+from users.models import Voter, Vote, VoterBallotReceipt
+import statistics
+import time
+
+class Command(BaseCommand):
+    help = 'Prints query plans and timings for the vote hot-path queries on the current database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--no-explain', action='store_true', help='Skip the query plans')
+
+    def handle(self, *args, **options):
+        voter = Voter.objects.order_by('-id').first()
+        if voter is None:
+            self.stdout.write(self.style.ERROR('No voters in the database; seed one first (e.g. synth_election)'))
+            return
+        election_id = current_election_id()
+        votes = Vote.objects.filter(election_id=election_id)
+        newest = votes.order_by('-timestamp', '-id').values('timestamp', 'id').first()
+        self.stdout.write(f"{Voter.objects.count()} voters, {Vote.objects.count()} votes\n")
+
+        queries = {
+            'has_voted (receipt)': lambda: VoterBallotReceipt.objects.filter(voter_id=voter.id, election_id=election_id).values('id')[:1],
+            'login lookup (Upper(voters_id))': lambda: Voter.objects.alias(u=Upper('voters_id')).filter(u=voter.voters_id.upper()),
+            'tally (group by candidate)': lambda: Vote.objects.values('candidate_id').annotate(n=Count('id')).order_by(),
+            'votes page (-timestamp, -id)': lambda: votes.order_by('-timestamp', '-id')[:100],
+        }
+        if newest:
+            queries['votes next page (keyset)'] = lambda: votes.filter(
+                Q(timestamp__lt=newest['timestamp']) | Q(timestamp=newest['timestamp'], id__lt=newest['id'])
+            ).order_by('-timestamp', '-id')[:100]
+
+        for name, build in queries.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            if not options['no_explain']:
+                self.stdout.write(build().explain())
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"  median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms over {len(timings)} runs\n"
+            )
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from core.ballot import ballot_positions, build_ballot
+from core.elections import current_election_id
+from core.middleware import brotli
+from core.models import Position
+from core.renderers import FastJSONRenderer
+from core.serializers import PositionSerializer
+from users.api_views import VOTE_ROW_FIELDS, vote_row
+from users.models import Vote
+import statistics
+import time
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+class Command(BaseCommand):
+    help = 'Times JSON rendering and compression of the api_admin_votes and api_ballot payloads on the current database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Vote rows in the votes payload')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per step')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        election_id = current_election_id()
+        rows = list(Vote.objects.filter(election_id=election_id).order_by('-timestamp', '-id').values(*VOTE_ROW_FIELDS)[:options['rows']])
+        if len(rows) < options['rows']:
+            self.stdout.write(self.style.WARNING(
+                f"Only {len(rows)} votes in the current election; seed more with synth_election --voters N"
+            ))
+        positions = Position.objects.filter(election_id=election_id).prefetch_related('candidates').order_by('priority')
+        candidate_count = sum(len(p.candidates.all()) for p in positions)
+
+        payloads = {
+            f'votes ({len(rows)} rows)': lambda: {'results': [vote_row(row) for row in rows], 'next': None},
+            # The admin serializers the ballot was built with before core.ballot.ballot_positions
+            f'ballot via PositionSerializer ({candidate_count} candidates)': lambda: {
+                'positions': PositionSerializer(positions, many=True).data, 'election_title': ''
+            },
+            f'ballot ({candidate_count} candidates)': lambda: {
+                'positions': ballot_positions(election_id), 'election_title': ''
+            },
+        }
+        renderers = {'JSONRenderer': JSONRenderer(), 'FastJSONRenderer': FastJSONRenderer()}
+
+        for name, build in payloads.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            data, ms = timed(build, repeat)
+            self.stdout.write(f"  {'serialize':<22}{ms:>10.1f} ms")
+            for label, renderer in renderers.items():
+                body, ms = timed(lambda: renderer.render(data), repeat)
+                self.stdout.write(f"  {'render ' + label:<22}{ms:>10.1f} ms {len(body):>12,} bytes")
+            compressed, ms = timed(lambda: compress_string(body), repeat)
+            self.stdout.write(f"  {'gzip':<22}{ms:>10.1f} ms {len(compressed):>12,} bytes")
+            if brotli is not None:
+                compressed, ms = timed(lambda: brotli.compress(body, quality=settings.BROTLI_QUALITY), repeat)
+                self.stdout.write(f"  {'brotli':<22}{ms:>10.1f} ms {len(compressed):>12,} bytes")
+
+        # What api_ballot actually sends: rendered once, then served from the cache
+        _, ms = timed(build_ballot, repeat)
+        self.stdout.write(f"\nbuild_ballot (cache miss): {ms:.1f} ms")
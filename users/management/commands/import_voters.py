@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from users.importer import VoterImport, iter_records
+import json
+import sys
+import time
+
+class Command(BaseCommand):
+    help = 'Bulk-registers voters from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header row) or NDJSON file, "-" for stdin')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Records validated and inserted per chunk')
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes (default: CPU count)')
+        parser.add_argument('--errors', help='Write the per-row error report (NDJSON) to this file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        started = time.monotonic()
+
+        def report(job):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"  {job.created} created, {len(job.errors)} rejected ({job.created / max(elapsed, 1e-9):.0f} voters/s)")
+
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        with stream:
+            job = VoterImport(batch_size=options['batch_size'], workers=options['workers'])
+            job.run(iter_records(stream, fmt), on_batch=report)
+
+        if options['errors']:
+            with open(options['errors'], 'w', encoding='utf-8') as f:
+                for error in job.errors:
+                    f.write(json.dumps(error) + '\n')
+        else:
+            for error in job.errors[:20]:
+                self.stdout.write(self.style.WARNING(f"Row {error['row']}: {error['errors']}"))
+            if len(job.errors) > 20:
+                self.stdout.write(self.style.WARNING(f"... {len(job.errors) - 20} more (use --errors to save them all)"))
+
+        self.stdout.write(self.style.SUCCESS(f'Imported {job.created} voters ({len(job.errors)} rows rejected)'))
@@ -0,0 +1,242 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from core.elections import current_election_id
+from core.models import Position, Candidate
+from users.models import Voter, Vote
+from users import tally, tokens
+from users.writer import writer
+import bcrypt
+import json
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+VOTER_PREFIX = 'LT'
+PASSWORD = 'loadtest'
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class InProcessTransport:
+    """Django test client; also counts the SQL queries each request runs on its own thread."""
+    def __init__(self):
+        from django.test import Client
+        self.local = threading.local()
+        self.client_class = Client
+
+    def request(self, method, path, data=None, headers=None):
+        client = getattr(self.local, 'client', None) or self.client_class()
+        self.local.client = client
+        extra = {f"HTTP_{k.upper().replace('-', '_')}": v for k, v in (headers or {}).items()}
+        # An execute_wrapper, not CaptureQueriesContext: the test client's
+        # request_started signal resets connection.queries_log mid-request
+        queries = []
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            if method == 'GET':
+                response = client.get(path, data, **extra)
+            else:
+                response = client.post(path, json.dumps(data), content_type='application/json', **extra)
+        body = json.loads(response.content) if response.content and response['Content-Type'].startswith('application/json') else None
+        return response.status_code, body, response, len(queries)
+
+class HttpTransport:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, data=None, headers=None):
+        url = self.base_url + path
+        payload = None
+        if method == 'GET' and data:
+            url += '?' + urllib.parse.urlencode(data)
+        elif method == 'POST':
+            payload = json.dumps(data).encode('utf-8')
+        req = urllib.request.Request(url, data=payload, method=method, headers={'Content-Type': 'application/json', **(headers or {})})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                raw, status, response_headers = response.read(), response.status, response.headers
+        except urllib.error.HTTPError as e:
+            raw, status, response_headers = e.read(), e.code, e.headers
+        body = json.loads(raw) if raw and response_headers.get('Content-Type', '').startswith('application/json') else None
+        return status, body, response_headers, None
+
+class Command(BaseCommand):
+    help = 'Runs an election-day request mix (login, ballot, vote, admin stats) and reports latency percentiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server (default: in-process test client on a throwaway test database)')
+        parser.add_argument('--voters', type=int, default=200, help='Virtual voters, each logs in, loads the ballot twice and votes once')
+        parser.add_argument('--concurrency', type=int, default=1, help='Parallel virtual voters')
+        parser.add_argument('--admin-every', type=int, default=5, help='One admin stats poll per N voters')
+        parser.add_argument('--positions', type=int, default=4)
+        parser.add_argument('--candidates-per-position', type=int, default=5)
+        parser.add_argument('--bcrypt-rounds', type=int, default=12, help='Cost of the shared voter password hash')
+        parser.add_argument('--keep', action='store_true', help='With --url: keep the LT* voters created for the run')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if options['url']:
+            transport = HttpTransport(options['url'])
+            fixture = self.create_fixture(options)
+            try:
+                results = self.run(transport, fixture, options)
+            finally:
+                if not options['keep']:
+                    self.delete_fixture(fixture)
+        else:
+            from django.test.utils import setup_test_environment, teardown_test_environment
+            from django.test.runner import DiscoverRunner
+            setup_test_environment()
+            runner = DiscoverRunner(verbosity=0)
+            old_config = runner.setup_databases()
+            try:
+                fixture = self.create_fixture(options)
+                results = self.run(InProcessTransport(), fixture, options)
+            finally:
+                writer.stop()
+                runner.teardown_databases(old_config)
+                teardown_test_environment()
+
+        self.print_results(results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def create_fixture(self, options):
+        hashed = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(options['bcrypt_rounds'])).decode('utf-8')
+        positions = []
+        election_id = current_election_id()
+        if not Position.objects.filter(election_id=election_id).exists():
+            for p in range(options['positions']):
+                position = Position.objects.create(election_id=election_id, description=f"Load Test Position {p + 1}", max_vote=1 + p % 2, priority=p + 1)
+                Candidate.objects.bulk_create([
+                    Candidate(election_id=election_id, position=position, firstname=f"Candidate {p + 1}.{c + 1}", lastname='LT')
+                    for c in range(options['candidates_per_position'])
+                ])
+                positions.append(position.id)
+        run_id = ''.join(random.choices('ABCDEFGHJKLMNPQRSTUVWXYZ', k=3))
+        voters = Voter.objects.bulk_create([
+            Voter(voters_id=f"{VOTER_PREFIX}{run_id}{i:07d}", password=hashed, firstname='Load', lastname=f"Tester {i}",
+                  aadhaar_hash=f"{VOTER_PREFIX}-{run_id}-{i}", address='Load test')
+            for i in range(options['voters'])
+        ], batch_size=1000)
+        return {'voters': [v.voters_id for v in voters], 'positions': positions}
+
+    @transaction.atomic
+    def delete_fixture(self, fixture):
+        voters = Voter.objects.filter(voters_id__in=fixture['voters'])
+        tally.discard_votes(Vote.objects.filter(voter__in=voters))
+        voters.delete()
+        Position.objects.filter(id__in=fixture['positions']).delete()
+
+    def run(self, transport, fixture, options):
+        samples = {}
+        lock = threading.Lock()
+
+        # Ballots written by the vote-writer thread or the ballot log are not the
+        # request's queries (nor one ballot's: they are batched), so votes get none
+        writes_elsewhere = settings.VOTE_WRITER_THREADED or bool(settings.VOTE_LOG_DIR)
+
+        def call(name, method, path, data=None, headers=None, counted=True):
+            started = time.perf_counter()
+            status, body, response_headers, queries = transport.request(method, path, data, headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            if not counted:
+                queries = None
+            with lock:
+                samples.setdefault(name, []).append((elapsed, status, queries))
+            return status, body, response_headers
+
+        # Minted with this project's SECRET_KEY instead of logging in as a real admin
+        admin_headers = {'Authorization': f"Token {tokens.issue(0, tokens.ADMIN)}"}
+
+        def voter_session(index, voters_id):
+            status, body, _ = call('login', 'POST', '/api/login/', {'voter_id': voters_id, 'password': PASSWORD})
+            if status != 200:
+                return
+            token = body['token']
+            status, ballot, headers = call('ballot', 'GET', '/api/ballot/', {'token': token})
+            if status != 200:
+                return
+            votes = {
+                str(pos['id']): [c['id'] for c in random.sample(pos['candidates'], min(pos['max_vote'], len(pos['candidates'])))]
+                for pos in ballot['positions'] if pos['candidates']
+            }
+            status, body, _ = call('vote', 'POST', '/api/vote/', {'token': token, 'votes': votes}, counted=not writes_elsewhere)
+            if status == 200:
+                token = body['token']
+            # Returning voter: the conditional reload is usually a 304
+            etag = headers.get('ETag')
+            call('ballot (revalidate)', 'GET', '/api/ballot/', {'token': token}, {'If-None-Match': etag} if etag else None)
+            if index % options['admin_every'] == 0:
+                call('admin stats', 'GET', '/api/admin/stats/', headers=admin_headers)
+
+        def voter_session_closing(index, voters_id):
+            try:
+                voter_session(index, voters_id)
+            finally:
+                # The test client skips the request_finished cleanup; don't leave
+                # one connection per pool thread open on the test database
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(voter_session_closing, range(len(fixture['voters'])), fixture['voters']))
+        wall = time.perf_counter() - started
+
+        return {
+            'meta': {
+                'commit': self.git_commit(),
+                'mode': options['url'] or 'in-process',
+                'voters': options['voters'],
+                'concurrency': options['concurrency'],
+                'bcrypt_rounds': options['bcrypt_rounds'],
+                'wall_seconds': round(wall, 3),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            },
+            'endpoints': {name: self.summarize(rows, wall) for name, rows in samples.items()},
+            'total': self.summarize([row for rows in samples.values() for row in rows], wall),
+        }
+
+    def summarize(self, rows, wall):
+        latencies = sorted(row[0] for row in rows)
+        queries = [row[2] for row in rows if row[2] is not None]
+        return {
+            'requests': len(rows),
+            'errors': sum(1 for row in rows if row[1] >= 400),
+            'throughput_rps': round(len(rows) / wall, 2) if wall else None,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2),
+            'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_results(self, results):
+        meta = results['meta']
+        self.stdout.write(f"{meta['voters']} voters, concurrency {meta['concurrency']}, {meta['mode']}, {meta['wall_seconds']}s\n")
+        self.stdout.write(f"{'endpoint':<22}{'reqs':>7}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}")
+        for name, row in list(results['endpoints'].items()) + [('TOTAL', results['total'])]:
+            self.stdout.write(
+                f"{name:<22}{row['requests']:>7}{row['errors']:>6}{row['throughput_rps']:>9}"
+                f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{str(row['queries_per_request']):>9}"
+            )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from users.tally import rebuild_tallies
+
+class Command(BaseCommand):
+    help = 'Rebuilds the materialized candidate/position vote tallies from the Vote table'
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding vote tallies...")
+        total = rebuild_tallies()
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt tallies ({total} votes counted)'))
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-18 17:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_tallies(apps, schema_editor):
+    Vote = apps.get_model('users', 'Vote')
+    CandidateTally = apps.get_model('users', 'CandidateTally')
+    PositionTally = apps.get_model('users', 'PositionTally')
+    by_candidate = Vote.objects.values_list('candidate_id').annotate(n=Count('id')).order_by()
+    CandidateTally.objects.bulk_create([CandidateTally(candidate_id=pk, votes=n) for pk, n in by_candidate])
+    by_position = Vote.objects.values_list('position_id').annotate(n=Count('id')).order_by()
+    PositionTally.objects.bulk_create([PositionTally(position_id=pk, votes=n) for pk, n in by_position])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_rename_platform_candidate_manifesto'),
+        ('users', '0007_voter_gender'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateTally',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='tally', serialize=False, to='core.candidate')),
+                ('votes', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PositionTally',
+            fields=[
+                ('position', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='tally', serialize=False, to='core.position')),
+                ('votes', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_tallies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0 on 2026-10-18 17:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_receipts(apps, schema_editor):
+    Vote = apps.get_model('users', 'Vote')
+    VoterBallotReceipt = apps.get_model('users', 'VoterBallotReceipt')
+    voter_ids = Vote.objects.values_list('voter_id', flat=True).distinct().order_by()
+    VoterBallotReceipt.objects.bulk_create([VoterBallotReceipt(voter_id=pk) for pk in voter_ids], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_rename_platform_candidate_manifesto'),
+        ('users', '0008_tallies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoterBallotReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('voter', 'position', 'candidate'), name='unique_vote_per_candidate'),
+        ),
+        migrations.AddField(
+            model_name='voterballotreceipt',
+            name='voter',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ballot_receipt', to='users.voter'),
+        ),
+        migrations.RunPython(backfill_receipts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-18 17:33
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_rename_platform_candidate_manifesto'),
+        ('users', '0009_vote_receipts_and_constraints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vote',
+            name='candidate',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='core.candidate'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='voter',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='users.voter'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['candidate', 'position'], name='vote_candidate_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['timestamp', 'id'], name='vote_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(django.db.models.functions.text.Upper('voters_id'), name='voter_voters_id_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0 on 2026-10-18 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_first_election(apps, schema_editor):
+    election = apps.get_model('core', 'Election').objects.order_by('id').first()
+    apps.get_model('users', 'Vote').objects.update(election=election)
+    apps.get_model('users', 'VoterBallotReceipt').objects.update(election=election)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_elections'),
+        ('users', '0010_vote_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='election',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='core.election'),
+        ),
+        migrations.AddField(
+            model_name='voterballotreceipt',
+            name='election',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ballot_receipts', to='core.election'),
+        ),
+        migrations.RunPython(assign_first_election, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='vote',
+            name='election',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='core.election'),
+        ),
+        migrations.AlterField(
+            model_name='voterballotreceipt',
+            name='election',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ballot_receipts', to='core.election'),
+        ),
+        migrations.AlterField(
+            model_name='voterballotreceipt',
+            name='voter',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ballot_receipts', to='users.voter'),
+        ),
+        migrations.AddConstraint(
+            model_name='voterballotreceipt',
+            constraint=models.UniqueConstraint(fields=('voter', 'election'), name='unique_receipt_per_election'),
+        ),
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='vote_timestamp_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['election', 'timestamp', 'id'], name='vote_election_timestamp_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_elections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voter',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='voter',
+            name='photo',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='voters/'),
+        ),
+    ]
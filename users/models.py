@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 
 class VoterManager(BaseUserManager):
@@ -19,7 +20,8 @@ class Voter(models.Model):
     firstname = models.CharField(max_length=30)
     middlename = models.CharField(max_length=30, blank=True, null=True)
     lastname = models.CharField(max_length=30)
-    photo = models.ImageField(upload_to='voters/', blank=True, null=True)
+    photo = models.ImageField(upload_to='voters/', blank=True, null=True, db_index=True)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)  # core.images
     
     GENDER_CHOICES = [
         ('Male', 'Male'),
@@ -39,14 +41,87 @@ class Voter(models.Model):
     dob = models.DateField(null=True, blank=True)
     age = models.IntegerField(default=18)
     address = models.TextField()
+
+    class Meta:
+        indexes = [
+            # Case-insensitive login lookup (api_login filters on Upper(voters_id))
+            models.Index(Upper('voters_id'), name='voter_voters_id_upper_idx'),
+        ]
     
     def __str__(self):
         return f"{self.firstname} {self.lastname}"
 
-from core.models import Position, Candidate
+from core.models import Election, Position, Candidate
 
 class Vote(models.Model):
-    voter = models.ForeignKey(Voter, on_delete=models.CASCADE, related_name='votes')
-    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='votes')
+    # Denormalized from position so an election's votes can be listed and
+    # purged without joins (indexed by vote_election_timestamp_id_idx)
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='votes', db_index=False)
+    # voter/candidate lookups are served by the composite indexes below, so the
+    # single-column foreign key indexes would only slow down inserts
+    voter = models.ForeignKey(Voter, on_delete=models.CASCADE, related_name='votes', db_index=False)
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='votes', db_index=False)
     position = models.ForeignKey(Position, on_delete=models.CASCADE, related_name='votes')
     timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Also the (voter, position) index: has-voted checks and per-voter deletes
+            models.UniqueConstraint(fields=['voter', 'position', 'candidate'], name='unique_vote_per_candidate'),
+        ]
+        indexes = [
+            # Tally rebuilds group by candidate/position straight from the index
+            models.Index(fields=['candidate', 'position'], name='vote_candidate_position_idx'),
+            # Keyset pagination in api_admin_votes orders by (-timestamp, -id) within an election
+            models.Index(fields=['election', 'timestamp', 'id'], name='vote_election_timestamp_id_idx'),
+        ]
+
+# One row per voter and election in which they cast a ballot. Its unique
+# (voter, election) pair is the double-submission guard: the second concurrent
+# insert fails inside the vote transaction.
+class VoterBallotReceipt(models.Model):
+    voter = models.ForeignKey(Voter, on_delete=models.CASCADE, related_name='ballot_receipts', db_index=False)
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name='ballot_receipts')
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['voter', 'election'], name='unique_receipt_per_election'),
+        ]
+
+    def __str__(self):
+        return f"Receipt for {self.voter}"
+
+# Materialized vote counts, kept in step with Vote by users.tally
+class CandidateTally(models.Model):
+    candidate = models.OneToOneField(Candidate, on_delete=models.CASCADE, primary_key=True, related_name='tally')
+    votes = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.candidate}: {self.votes}"
+
+class PositionTally(models.Model):
+    position = models.OneToOneField(Position, on_delete=models.CASCADE, primary_key=True, related_name='tally')
+    votes = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.position}: {self.votes}"
+
+# A voter roll uploaded through api/admin/voters/import/. It is imported in the
+# background (users.api_views.import_in_background) and its progress is polled here.
+class VoterImportJob(models.Model):
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
+    created = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)  # the first rejected rows, by row number
+    error = models.TextField(blank=True)  # why a failed import stopped
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Voter import {self.pk} ({self.status})"
@@ -0,0 +1,18 @@
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+
+class VoterPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+class VoterCursorPagination(CursorPagination):
+    # No COUNT(*) per page; for scripted walks over very large voter rolls
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-id'
+
+class CandidatePagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -1,23 +1,37 @@
 from rest_framework import serializers
-from .models import Voter, Vote
+from .models import Voter, Vote, VoterBallotReceipt, VoterImportJob
+from core.elections import current_election_id
+from core.images import variant_urls
 from core.models import Candidate, Position
 
 class VoterSerializer(serializers.ModelSerializer):
     has_voted = serializers.SerializerMethodField()
     password_set = serializers.SerializerMethodField()
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Voter
-        fields = ['id', 'voters_id', 'firstname', 'middlename', 'lastname', 'photo', 'aadhaar_hash', 'address', 'has_voted', 'age', 'identity_type', 'gender', 'password', 'password_set']
+        fields = ['id', 'voters_id', 'firstname', 'middlename', 'lastname', 'photo', 'photo_variants', 'aadhaar_hash', 'address', 'has_voted', 'age', 'identity_type', 'gender', 'password', 'password_set']
         extra_kwargs = {'password': {'write_only': True}}
         
     def get_has_voted(self, obj):
-        return Vote.objects.filter(voter=obj).exists()
+        # Listings annotate has_voted (see users.api_views.annotated_voters); fall back for single objects
+        if hasattr(obj, 'has_voted'):
+            return obj.has_voted
+        return VoterBallotReceipt.objects.filter(voter=obj, election_id=current_election_id()).exists()
 
     def get_password_set(self, obj):
         return bool(obj.password)
 
+    def get_photo_variants(self, obj):
+        return variant_urls(obj.photo, obj.photo_variants)
+
 class VoteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Vote
         fields = ['id', 'voter', 'candidate', 'position', 'timestamp']
+
+class VoterImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = VoterImportJob
+        fields = ['id', 'status', 'created', 'rejected', 'errors', 'error', 'started_at', 'finished_at']
@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from core.images import schedule_variants
+from core.storage import release_files, replaced_files
+from .models import Voter
+from . import tokens
+
+# Signed tokens stay valid until they expire; cut them off when the account goes away
+
+@receiver(post_delete, sender=Voter)
+def revoke_voter_tokens(sender, instance, **kwargs):
+    tokens.revoke_subject(tokens.VOTER, instance.pk)
+
+@receiver(post_delete, sender=User)
+def revoke_admin_tokens(sender, instance, **kwargs):
+    tokens.revoke_subject(tokens.ADMIN, instance.pk)
+
+@receiver(post_save, sender=User)
+def revoke_demoted_admin_tokens(sender, instance, created, **kwargs):
+    if not created and (not instance.is_active or not (instance.is_staff or instance.is_superuser)):
+        tokens.revoke_subject(tokens.ADMIN, instance.pk)
+
+@receiver(post_save, sender=Voter)
+def voter_photo_changed(sender, instance, **kwargs):
+    schedule_variants(instance, ['photo'])
+
+@receiver(pre_save, sender=Voter)
+def voter_photo_replaced(sender, instance, **kwargs):
+    instance._replaced_files = replaced_files(instance, ['photo'])
+
+@receiver(post_save, sender=Voter)
+def release_replaced_voter_photo(sender, instance, **kwargs):
+    release_files(instance.photo.storage, getattr(instance, '_replaced_files', []))
+
+@receiver(post_delete, sender=Voter)
+def release_voter_photo(sender, instance, **kwargs):
+    release_files(instance.photo.storage, [instance.photo.name])
@@ -0,0 +1,48 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, F
+from .models import Vote, CandidateTally, PositionTally
+from .live import notify_tally_changed
+
+# Vote counts are materialized in CandidateTally/PositionTally so the dashboard
+# never has to scan the vote table. Every code path that creates or deletes
+# Vote rows must go through these helpers inside the same transaction.
+
+def _apply(model, key, counts, sign):
+    if not counts:
+        return
+    transaction.on_commit(notify_tally_changed)
+    if sign > 0:
+        model.objects.bulk_create([model(**{key: pk}) for pk in counts], ignore_conflicts=True)
+    for pk, n in counts.items():
+        model.objects.filter(**{key: pk}).update(votes=F('votes') + sign * n)
+
+def record_votes(votes):
+    """Add freshly inserted Vote objects to the tallies."""
+    _apply(CandidateTally, 'candidate_id', Counter(v.candidate_id for v in votes), 1)
+    _apply(PositionTally, 'position_id', Counter(v.position_id for v in votes), 1)
+
+def discard_votes(queryset):
+    """Subtract the votes in ``queryset`` from the tallies (call before deleting them)."""
+    by_candidate = Counter(dict(queryset.values_list('candidate_id').annotate(n=Count('id')).order_by()))
+    by_position = Counter(dict(queryset.values_list('position_id').annotate(n=Count('id')).order_by()))
+    _apply(CandidateTally, 'candidate_id', by_candidate, -1)
+    _apply(PositionTally, 'position_id', by_position, -1)
+
+def reset_tallies():
+    transaction.on_commit(notify_tally_changed)
+    CandidateTally.objects.all().delete()
+    PositionTally.objects.all().delete()
+
+@transaction.atomic
+def rebuild_tallies():
+    """Recompute every tally from the Vote table. Returns the number of votes counted."""
+    reset_tallies()
+    by_candidate = Vote.objects.values_list('candidate_id').annotate(n=Count('id')).order_by()
+    CandidateTally.objects.bulk_create(
+        [CandidateTally(candidate_id=pk, votes=n) for pk, n in by_candidate], batch_size=1000
+    )
+    by_position = Vote.objects.values_list('position_id').annotate(n=Count('id')).order_by()
+    position_rows = [PositionTally(position_id=pk, votes=n) for pk, n in by_position]
+    PositionTally.objects.bulk_create(position_rows, batch_size=1000)
+    return sum(row.votes for row in position_rows)
@@ -1,3 +1,466 @@
-from django.test import TestCase
+import asyncio
+import csv
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from collections import Counter
+from unittest import mock
+from asgiref.sync import async_to_sync
+import bcrypt
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from core.elections import current_election_id, purge_election, start_election
+from core.models import Election, Position, Candidate
+from core import metrics
+from core.querylog import normalize_sql
+from . import hashing, tokens, urls
+from .models import Voter, Vote, VoterImportJob
+from .ballotlog import BallotLog
+from .writer import VoteWriter, write_ballots, ACCEPTED, IN_FLIGHT, REJECTED
 
-# Create your tests here.
+# Query-count regression suite. The same requests are made against every
+# endpoint in users/urls.py after seeding the database at each of SIZES, and
+# each endpoint must run the same number of queries at every size: a count
+# that grows with the data is an N+1 (a query per row, usually a serializer
+# field or a loop over a queryset). The largest size is also held to a peak
+# memory (tracemalloc) budget per request, and to a wall-time budget only when
+# QUERY_SUITE_TIME_BUDGET is set, since timings vary too much on shared machines.
+#
+#   python manage.py test users
+#   QUERY_SUITE_TIME_BUDGET=0.5 python manage.py test users
+
+# Seed sizes, in voters; positions (3 candidates each) grow along with them
+SIZES = (5, 50, 250)
+TIME_BUDGET = float(os.environ.get('QUERY_SUITE_TIME_BUDGET') or 0)  # seconds per request at the largest size; 0 skips
+MEMORY_BUDGET = 4 * 1024 * 1024  # peak bytes allocated per request at the largest size
+
+# Endpoints the suite does not request, and why
+EXCLUDED = {
+    'api_dashboard_stream': 'SSE stream that never ends; its snapshot comes from the same tallies as api_dashboard_stats',
+    'api_admin_election_purge': 'deletes in a background thread, in chunks by design (core.elections.purge_election)',
+}
+
+VOTER_PASSWORD = 'secret'
+# bcrypt at its lowest cost, so seeding and the voter create/login requests stay fast
+VOTER_HASH = bcrypt.hashpw(VOTER_PASSWORD.encode('utf-8'), bcrypt.gensalt(4)).decode('utf-8')
+
+def positions_for(size):
+    # 1, 3 and 11 positions: the copied ballot stays within one bulk_create
+    # batch (SQLite takes 999 parameters per statement) at every size
+    return size // 25 + 1
+
+@override_settings(
+    VOTE_WRITER_THREADED=False,
+    VOTE_LOG_DIR=None,
+    VOTER_IMPORT_THREADED=False,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class QueryCountTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.enterClassContext(mock.patch('bcrypt.gensalt', functools.partial(bcrypt.gensalt, 4)))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cache.clear()
+        User.objects.create_user('admin', password='admin', is_staff=True)
+        cls.admin_token = tokens.issue(User.objects.get(username='admin').id, tokens.ADMIN)
+        # Each measured request is rolled back, so the polled import is made here
+        VoterImportJob.objects.create(status='done', created=2)
+        cls.measurements = {}
+        for size in SIZES:
+            cls.grow_to(size)
+            cls.measurements[size] = {label: cls.measure(call) for label, url_name, call in cls.endpoints()}
+
+    @classmethod
+    def grow_to(cls, size):
+        """Add voters, positions, candidates and votes to the current election up to ``size`` voters."""
+        election_id = current_election_id()
+        existing = Voter.objects.count()
+        Voter.objects.bulk_create([
+            Voter(voters_id=f'V{n:06d}', password=VOTER_HASH, firstname='Voter', lastname=f'{n}',
+                  aadhaar_hash=f'{n:012d}', address='Somewhere')
+            for n in range(existing, size)
+        ])
+        for priority in range(Position.objects.filter(election_id=election_id).count(), positions_for(size)):
+            position = Position.objects.create(election_id=election_id, description=f'Position {priority}', max_vote=1, priority=priority)
+            Candidate.objects.bulk_create([
+                Candidate(election_id=election_id, position=position, candidate_id=f'C{priority:04d}{n}',
+                          firstname='Candidate', lastname=f'{priority}-{n}')
+                for n in range(3)
+            ])
+        # Every other voter votes, for the first candidate of each position;
+        # the newest voter never has, so the ballot and vote requests can use them
+        first = {}
+        for candidate_id, position_id in Candidate.objects.filter(election_id=election_id).order_by('id').values_list('id', 'position_id'):
+            first.setdefault(position_id, candidate_id)
+        new_voters = list(Voter.objects.filter(voters_id__gte=f'V{existing:06d}').order_by('id').values_list('id', flat=True))
+        write_ballots([(voter_id, election_id, list(first.items())) for voter_id in new_voters[:-1:2]])
+
+    @classmethod
+    def endpoints(cls):
+        """(label, url name, call) for every request the suite makes; call() returns the response."""
+        from django.test import Client
+        client = Client()
+        admin = {'HTTP_AUTHORIZATION': f'Token {cls.admin_token}'}
+        election_id = current_election_id()
+
+        def voter():
+            # The newest voter, who has not voted (see grow_to)
+            return Voter.objects.order_by('-id').first()
+
+        def voter_token():
+            return tokens.issue(voter().id, tokens.VOTER)
+
+        def position():
+            return Position.objects.filter(election_id=election_id).order_by('-id').first()
+
+        def candidate():
+            return Candidate.objects.filter(election_id=election_id).order_by('-id').first()
+
+        def post_json(url, data, **extra):
+            return client.post(url, json.dumps(data), content_type='application/json', **extra)
+
+        def put_json(url, data):
+            return client.put(url, json.dumps(data), content_type='application/json', **admin)
+
+        def import_file():
+            rows = 'firstname,lastname,aadhaar_hash,address,password\nNew,Voter,999999999990,Here,pw\nOther,Voter,999999999991,Here,pw\n'
+            return SimpleUploadedFile('voters.csv', rows.encode('utf-8'), content_type='text/csv')
+
+        new_candidate = {'firstname': 'New', 'lastname': 'Candidate', 'position': None}
+
+        return [
+            ('login', 'api_login', lambda: post_json(reverse('api_login'), {'voter_id': voter().voters_id, 'password': VOTER_PASSWORD})),
+            ('ballot', 'api_ballot', lambda: client.get(reverse('api_ballot'), {'token': voter_token()})),
+            ('vote', 'api_vote', lambda: post_json(reverse('api_vote'), {
+                'token': voter_token(), 'votes': {str(candidate().position_id): [candidate().id]},
+            })),
+            ('logout', 'api_logout', lambda: post_json(reverse('api_logout'), {'token': voter_token()})),
+            ('admin login', 'api_admin_login', lambda: post_json(reverse('api_admin_login'), {'username': 'admin', 'password': 'admin'})),
+            ('dashboard stats', 'api_dashboard_stats', lambda: client.get(reverse('api_dashboard_stats'), **admin)),
+            ('voters list', 'api_admin_voters', lambda: client.get(reverse('api_admin_voters'), **admin)),
+            ('voters list (cursor)', 'api_admin_voters', lambda: client.get(reverse('api_admin_voters'), {'pagination': 'cursor'}, **admin)),
+            ('voters search', 'api_admin_voters', lambda: client.get(reverse('api_admin_voters'), {'search': 'V', 'has_voted': 'true'}, **admin)),
+            ('voter create', 'api_admin_voters', lambda: post_json(reverse('api_admin_voters'), {
+                'firstname': 'New', 'lastname': 'Voter', 'aadhaar_hash': '888888888888', 'address': 'Here', 'password': 'pw',
+            }, **admin)),
+            ('voters import', 'api_admin_voters_import', lambda: client.post(reverse('api_admin_voters_import'), {'file': import_file()}, **admin)),
+            ('voters import status', 'api_admin_voters_import_detail', lambda: client.get(
+                reverse('api_admin_voters_import_detail', args=[VoterImportJob.objects.first().id]), **admin
+            )),
+            ('voter update', 'api_admin_voter_detail', lambda: put_json(reverse('api_admin_voter_detail', args=[voter().id]), {'address': 'Elsewhere'})),
+            ('voter delete', 'api_admin_voter_detail', lambda: client.delete(reverse('api_admin_voter_detail', args=[Voter.objects.order_by('id').first().id]), **admin)),
+            ('candidates list', 'api_admin_candidates', lambda: client.get(reverse('api_admin_candidates'), **admin)),
+            ('candidates filtered', 'api_admin_candidates', lambda: client.get(reverse('api_admin_candidates'), {
+                'position': position().id, 'party_type': 'independent', 'is_approved': 'true', 'search': 'C',
+            }, **admin)),
+            ('candidate create', 'api_admin_candidates', lambda: post_json(reverse('api_admin_candidates'), {**new_candidate, 'position': position().id}, **admin)),
+            ('candidate update', 'api_admin_candidate_detail', lambda: put_json(reverse('api_admin_candidate_detail', args=[candidate().id]), {'party_name': 'Party'})),
+            ('candidate delete', 'api_admin_candidate_detail', lambda: client.delete(reverse('api_admin_candidate_detail', args=[candidate().id]), **admin)),
+            ('positions list', 'api_admin_positions', lambda: client.get(reverse('api_admin_positions'), **admin)),
+            ('positions with counts', 'api_admin_positions', lambda: client.get(reverse('api_admin_positions'), {'candidates': 'count'}, **admin)),
+            ('positions only', 'api_admin_positions', lambda: client.get(reverse('api_admin_positions'), {'candidates': 'none'}, **admin)),
+            ('position create', 'api_admin_positions', lambda: post_json(reverse('api_admin_positions'), {'description': 'New', 'max_vote': 1, 'priority': 99}, **admin)),
+            ('position update', 'api_admin_position_detail', lambda: put_json(reverse('api_admin_position_detail', args=[position().id]), {'max_vote': 2})),
+            ('position delete', 'api_admin_position_detail', lambda: client.delete(reverse('api_admin_position_detail', args=[position().id]), **admin)),
+            ('title', 'api_election_title', lambda: client.get(reverse('api_election_title'), **admin)),
+            ('title update', 'api_election_title', lambda: post_json(reverse('api_election_title'), {'header': 'Title'}, **admin)),
+            ('votes list', 'api_admin_votes', lambda: client.get(reverse('api_admin_votes'), **admin)),
+            ('votes export', 'api_admin_votes', lambda: client.get(reverse('api_admin_votes'), {'export': 'csv'}, **admin)),
+            ('reset votes', 'api_admin_reset_votes', lambda: post_json(reverse('api_admin_reset_votes'), {}, **admin)),
+            ('elections list', 'api_admin_elections', lambda: client.get(reverse('api_admin_elections'), **admin)),
+            ('election start', 'api_admin_elections', lambda: post_json(reverse('api_admin_elections'), {'title': 'Next'}, **admin)),
+            ('profiles', 'api_admin_profiles', lambda: client.get(reverse('api_admin_profiles'), **admin)),
+            ('profile detail', 'api_admin_profile_detail', lambda: client.get(reverse('api_admin_profile_detail', args=['none']), **admin)),
+            ('slow queries', 'api_admin_slow_queries', lambda: client.get(reverse('api_admin_slow_queries'), {'group': 'sql'}, **admin)),
+            ('slow queries clear', 'api_admin_slow_queries', lambda: client.delete(reverse('api_admin_slow_queries'), **admin)),
+        ]
+
+    @classmethod
+    def measure(cls, call):
+        """Query count, SQL, status, wall time and peak memory of one request, rolled back afterwards."""
+        def run():
+            cache.clear()
+            with transaction.atomic():
+                response = call()
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                transaction.set_rollback(True)
+            return response
+
+        # Recorded with an execute_wrapper as core.metrics does: the test client's
+        # request_started signal resets connection.queries_log mid-request
+        statements = []
+        def record(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            started = time.perf_counter()
+            response = run()
+            elapsed = time.perf_counter() - started
+        # Separately: tracemalloc slows everything down
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # The savepoint statements are the suite's, not the endpoint's
+        statements = [sql for sql in statements if 'SAVEPOINT' not in sql]
+        return {'queries': len(statements), 'sql': statements, 'status': response.status_code, 'seconds': elapsed, 'peak': peak}
+
+    def test_every_endpoint_is_covered(self):
+        names = {pattern.name for pattern in urls.urlpatterns}
+        covered = {url_name for label, url_name, call in self.endpoints()}
+        self.assertEqual(names - covered - set(EXCLUDED), set(), 'Add the new endpoints to QueryCountTests.endpoints')
+        self.assertEqual(covered & set(EXCLUDED), set())
+
+    def test_requests_succeed(self):
+        # A failing request (403, 400...) would hold its query count constant for the wrong reason
+        for label, result in self.measurements[SIZES[-1]].items():
+            with self.subTest(label):
+                expected = (404,) if label == 'profile detail' else (200, 201, 202, 204)
+                self.assertIn(result['status'], expected)
+
+    def test_query_count_does_not_grow_with_data(self):
+        for label in self.measurements[SIZES[0]]:
+            with self.subTest(label):
+                counts = {size: self.measurements[size][label]['queries'] for size in SIZES}
+                if len(set(counts.values())) > 1:
+                    repeated = Counter(normalize_sql(sql) for sql in self.measurements[SIZES[-1]][label]['sql'])
+                    culprits = '\n'.join(f'  {n}x {sql[:200]}' for sql, n in repeated.most_common() if n > 1)
+                    self.fail(f'queries per size {counts}; repeated at {SIZES[-1]}:\n{culprits}')
+
+    def test_memory_budget(self):
+        for label, result in self.measurements[SIZES[-1]].items():
+            with self.subTest(label):
+                self.assertLess(result['peak'], MEMORY_BUDGET)
+
+    @unittest.skipUnless(TIME_BUDGET, 'set QUERY_SUITE_TIME_BUDGET (seconds) to check request times')
+    def test_time_budget(self):
+        for label, result in self.measurements[SIZES[-1]].items():
+            with self.subTest(label):
+                self.assertLess(result['seconds'], TIME_BUDGET)
+
+
+def small_election(voters=2):
+    """The current election with one position, two candidates and ``voters`` voters who have not voted."""
+    election_id = current_election_id()
+    position = Position.objects.create(election_id=election_id, description='President', max_vote=1, priority=1)
+    candidates = [
+        Candidate.objects.create(election_id=election_id, position=position, candidate_id=f'C{n}', firstname='Candidate', lastname=str(n))
+        for n in range(2)
+    ]
+    voters = [
+        Voter.objects.create(voters_id=f'V{n:06d}', password=VOTER_HASH, firstname='Voter', lastname=str(n), aadhaar_hash=f'{n:012d}', address='Here')
+        for n in range(voters)
+    ]
+    return election_id, position, candidates, voters
+
+# Transactions really commit here: SQLite checks foreign keys at commit
+class WriteBallotsTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.election_id, self.position, self.candidates, self.voters = small_election()
+
+    def test_stale_candidate_only_fails_its_own_ballot(self):
+        stale = Candidate.objects.create(election_id=self.election_id, position=self.position, firstname='Gone', lastname='Soon')
+        stale_id = stale.id
+        stale.delete()
+        with self.assertLogs('users.writer', 'WARNING'):
+            results = write_ballots([
+                (self.voters[0].id, self.election_id, [(self.position.id, stale_id)]),
+                (self.voters[1].id, self.election_id, [(self.position.id, self.candidates[0].id)]),
+            ])
+        self.assertEqual(results, [REJECTED, ACCEPTED])
+        self.assertEqual(list(Vote.objects.values_list('voter_id', flat=True)), [self.voters[1].id])
+
+    def test_integrity_error_only_fails_its_own_ballot(self):
+        # The same candidate twice breaks unique_vote_per_candidate, which the
+        # upfront checks do not look for; the batch is then written ballot by ballot
+        pair = (self.position.id, self.candidates[0].id)
+        with self.assertLogs('users.writer', 'WARNING'):
+            results = write_ballots([
+                (self.voters[0].id, self.election_id, [pair, pair]),
+                (self.voters[1].id, self.election_id, [pair]),
+            ])
+        self.assertEqual(results, [REJECTED, ACCEPTED])
+        self.assertEqual(list(Vote.objects.values_list('voter_id', flat=True)), [self.voters[1].id])
+
+class BallotLogTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.election_id, self.position, self.candidates, self.voters = small_election()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_unappliable_ballot_is_set_aside(self):
+        log = BallotLog(self.directory.name)
+        self.addCleanup(log.stop)
+        stale = Candidate.objects.create(election_id=self.election_id, position=self.position, firstname='Gone', lastname='Soon')
+        with self.assertLogs('users', 'WARNING'):
+            # Acknowledged while the candidate still exists, applied after it is gone
+            with transaction.atomic():
+                log.accept([(self.voters[0].id, self.election_id, [(self.position.id, stale.id)])])
+                stale.delete()
+            log.accept([(self.voters[1].id, self.election_id, [(self.position.id, self.candidates[0].id)])])
+            self.assertTrue(log.drain(timeout=10))
+        self.assertEqual(list(Vote.objects.values_list('voter_id', flat=True)), [self.voters[1].id])
+        with open(os.path.join(self.directory.name, 'ballots.rejected')) as f:
+            self.assertEqual(json.loads(f.read())['v'], self.voters[0].id)
+        # Applied up to the end: a restart replays nothing
+        self.assertEqual(log.read_checkpoint(), log.size)
+
+    def test_reset_waits_for_the_log_then_answers_503(self):
+        User.objects.create_user('admin', password='admin', is_staff=True)
+        token = tokens.issue(User.objects.get(username='admin').id, tokens.ADMIN)
+        with mock.patch('users.api_views.writer.drain', return_value=False):
+            response = self.client.post(reverse('api_admin_reset_votes'), HTTP_AUTHORIZATION=f'Token {token}')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(Election.objects.count(), 1)
+
+class DashboardStreamTests(TestCase):
+    def test_refused_outside_asgi(self):
+        # The test client is a WSGI handler, like manage.py runserver
+        token = tokens.issue(1, tokens.ADMIN)
+        response = self.client.get(reverse('api_dashboard_stream'), {'token': token})
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.streaming)
+
+@override_settings(VOTER_IMPORT_THREADED=False)
+class VoterImportTests(TestCase):
+    def setUp(self):
+        User.objects.create_user('admin', password='admin', is_staff=True)
+        token = tokens.issue(User.objects.get(username='admin').id, tokens.ADMIN)
+        self.admin = {'HTTP_AUTHORIZATION': f'Token {token}'}
+
+    def upload(self, content):
+        upload = SimpleUploadedFile('voters.csv', content, content_type='text/csv')
+        response = self.client.post(reverse('api_admin_voters_import'), {'file': upload}, **self.admin)
+        self.assertEqual(response.status_code, 202)
+        return self.client.get(reverse('api_admin_voters_import_detail', args=[response.json()['id']]), **self.admin).json()
+
+    def test_imported_on_the_shared_pool(self):
+        with mock.patch('users.hashing.hash_passwords', wraps=hashing.hash_passwords) as hash_passwords:
+            job = self.upload(b'firstname,lastname,aadhaar_hash,address,password\nNew,Voter,999999999990,Here,pw\nDup,Voter,999999999990,Here,pw\n')
+        self.assertEqual((job['status'], job['created'], job['rejected']), ('done', 1, 1))
+        self.assertEqual(job['errors'][0]['row'], 2)
+        hash_passwords.assert_called_once()
+        self.assertTrue(bcrypt.checkpw(b'pw', Voter.objects.get().password.encode()))
+
+    def test_undecodable_row_is_reported(self):
+        job = self.upload(b'firstname,lastname,aadhaar_hash,address,password\nNew,Voter,999999999990,Here,pw\nBad,\xff\xfe,999999999991,Here,pw\n')
+        self.assertEqual((job['status'], job['error']), ('failed', 'Row 2: not valid UTF-8 text'))
+
+    def test_malformed_csv_row_is_reported(self):
+        oversized = b'x' * (csv.field_size_limit() + 1)
+        job = self.upload(b'firstname,lastname,aadhaar_hash,address,password\nNew,Voter,999999999990,Here,pw\nBad,Voter,999999999991,' + oversized + b',pw\n')
+        self.assertEqual(job['status'], 'failed')
+        self.assertTrue(job['error'].startswith('Row 2: malformed CSV'))
+
+class BackgroundVoterImportTests(TransactionTestCase):
+    def test_import_answers_at_once_and_finishes_in_the_background(self):
+        User.objects.create_user('admin', password='admin', is_staff=True)
+        admin = {'HTTP_AUTHORIZATION': f"Token {tokens.issue(User.objects.get(username='admin').id, tokens.ADMIN)}"}
+        upload = SimpleUploadedFile('voters.csv', b'firstname,lastname,aadhaar_hash,address,password\nNew,Voter,999999999990,Here,pw\n')
+        response = self.client.post(reverse('api_admin_voters_import'), {'file': upload}, **admin)
+        self.assertEqual((response.status_code, response.json()['status']), (202, 'running'))
+        url = reverse('api_admin_voters_import_detail', args=[response.json()['id']])
+        deadline = time.monotonic() + 10
+        while (job := self.client.get(url, **admin).json())['status'] == 'running' and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual((job['status'], job['created']), ('done', 1))
+
+class VoterDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user('admin', password='admin', is_staff=True)
+        token = tokens.issue(User.objects.get(username='admin').id, tokens.ADMIN)
+        self.admin = {'HTTP_AUTHORIZATION': f'Token {token}'}
+        self.voter = Voter.objects.create(voters_id='V000001', password=VOTER_HASH, firstname='Voter', lastname='One', aadhaar_hash='000000000001', address='Here')
+
+    def put(self, data):
+        url = reverse('api_admin_voter_detail', args=[self.voter.pk])
+        return self.client.put(url, json.dumps(data), content_type='application/json', **self.admin)
+
+    def test_password_change_revokes_voter_tokens(self):
+        token = tokens.issue(self.voter.id, tokens.VOTER)
+        self.assertEqual(self.put({'address': 'Elsewhere'}).status_code, 200)
+        self.assertIsNotNone(tokens.verify(token, tokens.VOTER))
+        self.assertEqual(self.put({'password': 'changed'}).status_code, 200)
+        self.assertIsNone(tokens.verify(token, tokens.VOTER))
+
+class PurgeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.election_id, self.position, self.candidates, self.voters = small_election()
+        start_election()
+        self.election = Election.objects.get(pk=self.election_id)
+
+    def test_failed_purge_is_recorded_and_can_be_retried(self):
+        with mock.patch.object(Candidate.objects, 'filter', side_effect=DatabaseError('disk I/O error')):
+            with self.assertRaises(DatabaseError):
+                purge_election(self.election)
+        self.election.refresh_from_db()
+        self.assertEqual((self.election.status, self.election.purge_error), ('purge_failed', 'disk I/O error'))
+
+        User.objects.create_user('admin', password='admin', is_staff=True)
+        token = tokens.issue(User.objects.get(username='admin').id, tokens.ADMIN)
+        with mock.patch('users.api_views.purge_in_background') as purge_in_background:
+            response = self.client.post(reverse('api_admin_election_purge', args=[self.election.pk]), HTTP_AUTHORIZATION=f'Token {token}')
+        self.assertEqual(response.status_code, 202)
+        purge_in_background.assert_called_once()
+
+        purge_election(self.election)
+        self.election.refresh_from_db()
+        self.assertEqual((self.election.status, self.election.purge_error), ('purged', ''))
+        self.assertFalse(Position.objects.filter(election=self.election).exists())
+
+class LoginTests(TestCase):
+    def test_unexpected_error_is_logged_and_counted(self):
+        Voter.objects.create(voters_id='V000001', password=VOTER_HASH, firstname='Voter', lastname='One', aadhaar_hash='000000000001', address='Here')
+        before = metrics.login_failures.values[('error',)]
+        with mock.patch('users.hashing.acheck_password', side_effect=ValueError('Invalid salt')):
+            with self.assertLogs('users.api_views', 'ERROR') as logs:
+                response = self.client.post(reverse('api_login'), {'voter_id': 'V000001', 'password': 'x'})
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('Login failed', logs.output[0])
+        self.assertEqual(metrics.login_failures.values[('error',)], before + 1)
+
+@override_settings(VOTE_WRITER_THREADED=True, VOTE_WRITER_TIMEOUT=0.2)
+class VoteWriterTimeoutTests(SimpleTestCase):
+    def setUp(self):
+        self.writer = VoteWriter()
+        self.release = threading.Event()
+        self.written = []
+
+        def accept(ballots):
+            self.written.extend(ballots)
+            self.release.wait(5)
+            return [ACCEPTED] * len(ballots)
+        self.writer.accept = accept
+        self.addCleanup(self.writer.stop)
+        self.addCleanup(self.release.set)
+
+    def test_ballot_in_a_batch_is_reported_in_flight(self):
+        self.assertEqual(async_to_sync(self.writer.write)((1, 1, [])), IN_FLIGHT)
+
+    def test_queued_ballot_is_withdrawn(self):
+        self.writer.submit((1, 1, []))  # holds the writer
+        with self.assertRaises(asyncio.TimeoutError):
+            async_to_sync(self.writer.write)((2, 1, []))
+        self.release.set()
+        self.writer.stop()
+        self.assertEqual(self.written, [(1, 1, [])])
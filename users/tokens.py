@@ -0,0 +1,62 @@
+import secrets
+import time
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from core.elections import current_election_id
+
+# Stateless session tokens: an HMAC-signed (SECRET_KEY), timestamped payload
+# carrying the subject id, role and a has-voted hint, so hot endpoints can
+# authenticate without touching the database. Revocations (logout, deleted
+# voters/admins) live in the cache for as long as a token could still be valid.
+
+SALT = 'evoting.tokens'
+VOTER = 'voter'
+ADMIN = 'admin'
+
+def _max_age(role):
+    return settings.ADMIN_TOKEN_MAX_AGE if role == ADMIN else settings.VOTER_TOKEN_MAX_AGE
+
+def issue(subject_id, role, voted_in=None):
+    payload = {
+        's': subject_id,
+        'r': role,
+        'j': secrets.token_urlsafe(8),
+        'i': int(time.time()),
+    }
+    if voted_in is not None:
+        # Id of the election the voter has voted in; a new election voids the hint
+        payload['v'] = voted_in
+    return signing.dumps(payload, salt=SALT)
+
+def verify(token, role=None):
+    """Return the token's claims, or None if it is forged, expired, revoked or of another role."""
+    if not token:
+        return None
+    try:
+        claims = signing.loads(str(token), salt=SALT, max_age=max(settings.VOTER_TOKEN_MAX_AGE, settings.ADMIN_TOKEN_MAX_AGE))
+    except signing.BadSignature:
+        return None
+    if role is not None and claims.get('r') != role:
+        return None
+    if time.time() - claims['i'] > _max_age(claims['r']):
+        return None
+    revoked = cache.get_many([f"tokens:revoked:{claims['j']}", f"tokens:revoked:{claims['r']}:{claims['s']}"])
+    if f"tokens:revoked:{claims['j']}" in revoked:
+        return None
+    revoked_at = revoked.get(f"tokens:revoked:{claims['r']}:{claims['s']}")
+    if revoked_at is not None and claims['i'] <= revoked_at:
+        return None
+    return claims
+
+def has_voted_hint(claims):
+    """True when the token proves the voter already voted in the current election."""
+    return claims.get('v') is not None and claims['v'] == current_election_id()
+
+def revoke(claims):
+    """Revoke one token (logout)."""
+    cache.set(f"tokens:revoked:{claims['j']}", True, _max_age(claims['r']))
+
+def revoke_subject(role, subject_id):
+    """Revoke every token issued so far to a voter/admin (deletion, password change)."""
+    cache.set(f"tokens:revoked:{role}:{subject_id}", int(time.time()), _max_age(role))
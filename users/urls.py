@@ -6,11 +6,15 @@ urlpatterns = [
     path('api/login/', api_views.api_login, name='api_login'),
     path('api/ballot/', api_views.api_ballot, name='api_ballot'),
     path('api/vote/', api_views.api_submit_vote, name='api_vote'),
+    path('api/logout/', api_views.api_logout, name='api_logout'),
     
     # Admin API Routes
     path('api/admin/login/', api_views.api_admin_login, name='api_admin_login'),
     path('api/admin/stats/', api_views.api_dashboard_stats, name='api_dashboard_stats'),
+    path('api/admin/stats/stream/', api_views.api_dashboard_stream, name='api_dashboard_stream'),
     path('api/admin/voters/', api_views.api_admin_voters, name='api_admin_voters'),
+    path('api/admin/voters/import/', api_views.api_admin_voters_import, name='api_admin_voters_import'),
+    path('api/admin/voters/import/<int:pk>/', api_views.api_admin_voters_import_detail, name='api_admin_voters_import_detail'),
     path('api/admin/voters/<int:pk>/', api_views.api_admin_voter_detail, name='api_admin_voter_detail'),
     path('api/admin/candidates/', api_views.api_admin_candidates, name='api_admin_candidates'),
     path('api/admin/candidates/<int:pk>/', api_views.api_admin_candidate_detail, name='api_admin_candidate_detail'),
@@ -19,4 +23,9 @@ urlpatterns = [
     path('api/admin/title/', api_views.api_election_title, name='api_election_title'),
     path('api/admin/votes/', api_views.api_admin_votes, name='api_admin_votes'),
     path('api/admin/votes/reset/', api_views.api_admin_reset_votes, name='api_admin_reset_votes'),
+    path('api/admin/elections/', api_views.api_admin_elections, name='api_admin_elections'),
+    path('api/admin/elections/<int:pk>/purge/', api_views.api_admin_election_purge, name='api_admin_election_purge'),
+    path('api/admin/profiles/', api_views.api_admin_profiles, name='api_admin_profiles'),
+    path('api/admin/profiles/<str:profile_id>/', api_views.api_admin_profile_detail, name='api_admin_profile_detail'),
+    path('api/admin/slow-queries/', api_views.api_admin_slow_queries, name='api_admin_slow_queries'),
 ]
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from core.models import Candidate
+from .models import Voter, Vote, VoterBallotReceipt
+from . import tally
+
+logger = logging.getLogger(__name__)
+
+# Every ballot is written by one thread per process, and whatever queued up
+# while the previous transaction was committing goes into the next one: a
+# surge of N ballots costs a handful of commits (and fsyncs) instead of N
+# transactions contending for SQLite's single write lock. With VOTE_LOG_DIR set
+# the batch is appended to the ballot log instead (users/ballotlog.py) and
+# applied to the database right after the voter has their answer.
+
+ACCEPTED = 'accepted'
+ALREADY_VOTED = 'already_voted'
+UNKNOWN_VOTER = 'unknown_voter'
+REJECTED = 'rejected'  # names a candidate or position that no longer exists
+IN_FLIGHT = 'in_flight'  # timed out inside a batch; may still be committed
+STOP = object()
+
+def ballot_status(keys):
+    """For {(voter_id, election_id)}: the voter ids that exist and the pairs that already have a receipt."""
+    voter_ids = {voter_id for voter_id, _ in keys}
+    known = set(Voter.objects.filter(id__in=voter_ids).values_list('id', flat=True))
+    voted = set(VoterBallotReceipt.objects.filter(
+        voter_id__in=voter_ids, election_id__in={election_id for _, election_id in keys}
+    ).values_list('voter_id', 'election_id'))
+    return known, voted
+
+def valid_choices(ballots):
+    """The (election_id, position_id, candidate_id) triples among ``ballots`` that still exist."""
+    candidate_ids = {cand_id for _, _, pairs in ballots for _, cand_id in pairs}
+    return {
+        (election_id, pos_id, cand_id)
+        for cand_id, pos_id, election_id in Candidate.objects.filter(id__in=candidate_ids)
+            .values_list('id', 'position_id', 'election_id')
+    }
+
+def write_ballots(ballots):
+    """Write [(voter_id, election_id, [(position_id, candidate_id)])] in one transaction; returns one result per ballot."""
+    try:
+        return _write_ballots(ballots)
+    except IntegrityError:
+        # Another process slipped a receipt in between the check and the
+        # insert, or one ballot is bad in a way _write_ballots did not catch.
+        # Write them one at a time so only that ballot fails, not the batch.
+        # One transaction each rather than savepoints in one: SQLite checks
+        # (deferred) foreign keys only when the outer transaction commits.
+        logger.warning("Ballot batch of %d failed an integrity check; writing ballots one by one", len(ballots), exc_info=True)
+        return [write_ballot(ballot) for ballot in ballots]
+
+def write_ballot(ballot):
+    for attempt in range(2):
+        try:
+            return _write_ballots([ballot])[0]
+        except IntegrityError:
+            # A lost receipt race comes back as ALREADY_VOTED on the second pass
+            if attempt:
+                logger.exception("Ballot of voter %s rejected", ballot[0])
+                return REJECTED
+
+@transaction.atomic
+def _write_ballots(ballots):
+    results = [ALREADY_VOTED] * len(ballots)
+    first = {}
+    for i, (voter_id, election_id, pairs) in enumerate(ballots):
+        first.setdefault((voter_id, election_id), i)
+    known, voted = ballot_status(first)
+    # Ballots were validated when submitted; a candidate or position deleted
+    # since then must not fail everybody else's ballot at commit
+    choices = valid_choices(ballots)
+
+    receipts, votes = [], []
+    for (voter_id, election_id), i in first.items():
+        pairs = ballots[i][2]
+        if voter_id not in known:
+            results[i] = UNKNOWN_VOTER
+        elif (voter_id, election_id) in voted:
+            continue
+        elif any((election_id, pos_id, cand_id) not in choices for pos_id, cand_id in pairs):
+            logger.warning("Ballot of voter %s rejected: it names a candidate or position that no longer exists", voter_id)
+            results[i] = REJECTED
+        else:
+            results[i] = ACCEPTED
+            receipts.append(VoterBallotReceipt(voter_id=voter_id, election_id=election_id))
+            votes.extend(
+                Vote(voter_id=voter_id, election_id=election_id, candidate_id=cand_id, position_id=pos_id)
+                for pos_id, cand_id in pairs
+            )
+
+    VoterBallotReceipt.objects.bulk_create(receipts)
+    Vote.objects.bulk_create(votes)
+    tally.record_votes(votes)
+    return results
+
+class VoteWriter:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.log = None
+
+    def start(self):
+        """Open the ballot log (if VOTE_LOG_DIR is set), replaying ballots a crash left unapplied."""
+        with self.lock:
+            if settings.VOTE_LOG_DIR and self.log is None:
+                from .ballotlog import BallotLog
+                self.log = BallotLog(settings.VOTE_LOG_DIR)
+
+    def accept(self, ballots):
+        if settings.VOTE_LOG_DIR:
+            if self.log is None:
+                self.start()
+            return self.log.accept(ballots)
+        return write_ballots(ballots)
+
+    def drain(self, timeout=None):
+        """Block until every accepted ballot is in the Vote table; False if ``timeout`` ran out first."""
+        if self.log is not None:
+            return self.log.drain(timeout)
+        return True
+
+    def submit(self, ballot):
+        """Queue one (voter_id, election_id, pairs) ballot; the Future resolves to ACCEPTED, ALREADY_VOTED or UNKNOWN_VOTER."""
+        future = Future()
+        self.queue.put((ballot, future))
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(target=self.run, name='vote-writer', daemon=True)
+                    self.thread.start()
+        return future
+
+    async def write(self, ballot):
+        """Write one ballot; like submit(), or IN_FLIGHT if VOTE_WRITER_TIMEOUT ran out
+        after the writer took it. asyncio.TimeoutError means it was never written."""
+        if not settings.VOTE_WRITER_THREADED:
+            return (await sync_to_async(self.accept)([ballot]))[0]
+        future = self.submit(ballot)
+        try:
+            # Shielded: whether the ballot can still be withdrawn is decided below
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), settings.VOTE_WRITER_TIMEOUT)
+        except asyncio.TimeoutError:
+            if future.cancel():
+                raise
+            if future.done():
+                return future.result()
+            return IN_FLIGHT
+
+    def stop(self):
+        """Write what is queued, then end the threads and close their connections."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(STOP)
+            self.thread.join()
+        if self.log is not None:
+            self.log.stop()
+            self.log = None
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self.queue.get()
+            while item is not STOP:
+                batch.append(item)
+                if len(batch) >= settings.VOTE_WRITER_MAX_BATCH:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = item is STOP
+            # Requests that timed out meanwhile have cancelled their futures; skip those ballots
+            batch = [(ballot, future) for ballot, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self.accept([ballot for ballot, _ in batch])
+            except Exception as e:
+                logger.exception("Vote writer: a batch of %d ballots failed", len(batch))
+                connection.close()
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+        connection.close()
+
+writer = VoteWriter()